@@ -5,26 +5,98 @@ import os
 import tempfile
 import time
 import shutil
+import socket
+import json
+import urllib.request
 
-def run_gesture_control(pptx_path):
+def find_free_port():
+    """Ask the OS for a free local TCP port."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def fetch_metrics(port):
+    """Read live metrics from the gesture control preview stream, or None if not available yet."""
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics.json", timeout=0.5) as response:
+            return json.loads(response.read())
+    except Exception:
+        return None
+
+def show_metrics(placeholder, metrics):
+    """Render live FPS, stage latency and gesture counters."""
+    gestures = metrics.get("gestures", {})
+    with placeholder.container():
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("FPS", f"{metrics.get('fps', 0):.1f}")
+        col2.metric("Capture", f"{metrics.get('capture_ms', 0):.1f} ms")
+        col3.metric("Gesture Processing", f"{metrics.get('gestures_ms', 0):.1f} ms")
+        col4.metric("Preview", f"{metrics.get('preview_ms', 0):.1f} ms")
+
+        gcol1, gcol2, gcol3 = st.columns(3)
+        gcol1.metric("Tilt Right", gestures.get("tilt_right", 0))
+        gcol2.metric("Tilt Left", gestures.get("tilt_left", 0))
+        gcol3.metric("Triple Tilt", gestures.get("triple_tilt", 0))
+        st.caption(f"{'✅ Head detected' if metrics.get('head_detected') else '❌ No head detected'} · "
+                   f"Frames: {metrics.get('frames', 0)} · Stream quality: {metrics.get('stream_quality', 0)}")
+
+def run_gesture_control(pptx_path, live_preview=True, timeout=300):
     """Run gesture control script with the given PowerPoint file path."""
     try:
         print(f"Running gesture_control.py with file: {pptx_path}")
         
-        # Use shell=True for Windows compatibility
-        result = subprocess.run(
-            [sys.executable, "gesture_control.py", pptx_path],
-            check=True,
-            capture_output=True,
-            text=True,
-            shell=True,
-            timeout=300  # 5 minute timeout
-        )
+        command = [sys.executable, "gesture_control.py", pptx_path]
+        port = None
+        if live_preview:
+            port = find_free_port()
+            command += ["--stream-port", str(port)]
+        
+        # Output goes to temporary files so a long session can never fill a pipe and stall the script
+        with tempfile.TemporaryFile() as stdout_file, tempfile.TemporaryFile() as stderr_file:
+            # Use shell=True for Windows compatibility
+            process = subprocess.Popen(command, stdout=stdout_file, stderr=stderr_file, shell=True)
+            
+            stream_placeholder = None
+            metrics_placeholder = None
+            stream_shown = False
+            if port:
+                # The stream is only embedded once the script serves metrics; an <img> pointing at a
+                # port nobody listens on yet would stay broken instead of retrying
+                stream_placeholder = st.empty()
+                stream_placeholder.info("📷 Waiting for the camera to start...")
+                metrics_placeholder = st.empty()
+            
+            start_time = time.time()
+            while process.poll() is None:
+                if time.time() - start_time > timeout:
+                    process.kill()
+                    process.wait()
+                    raise subprocess.TimeoutExpired(command, timeout)
+                if metrics_placeholder is not None:
+                    metrics = fetch_metrics(port)
+                    if metrics:
+                        if not stream_shown:
+                            # Cache-busting query so a broken image from an earlier run is not reused
+                            stream_placeholder.markdown(
+                                f'<img src="http://127.0.0.1:{port}/stream.mjpg?t={int(time.time())}" style="width: 100%;">',
+                                unsafe_allow_html=True
+                            )
+                            stream_shown = True
+                        show_metrics(metrics_placeholder, metrics)
+                time.sleep(0.5)
+            
+            stdout_file.seek(0)
+            stderr_file.seek(0)
+            stdout = stdout_file.read().decode(errors="replace")
+            stderr = stderr_file.read().decode(errors="replace")
+        
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, command, output=stdout, stderr=stderr)
         
         st.success("Head gesture control completed successfully!")
-        if result.stdout:
+        if stdout:
             st.write("Output from gesture_control.py:")
-            st.code(result.stdout)
+            st.code(stdout)
         print("Head gesture control process completed.")
         
     except subprocess.TimeoutExpired:
@@ -177,11 +249,16 @@ def main():
             - Triple tilt requires more pronounced head movement than regular navigation tilts
             """)
 
+            live_preview = st.checkbox(
+                "📺 Show live camera preview and metrics on this page", value=True,
+                help="Streams a downscaled preview from the gesture control process to this page"
+            )
+
             if st.button("🚀 Start Head Gesture Control", type="primary"):
                 if os.path.exists(pptx_path):
-                    with st.spinner("Starting head gesture control... Please wait"):
+                    with st.spinner("Head gesture control is running... Please wait"):
                         try:
-                            run_gesture_control(pptx_path)
+                            run_gesture_control(pptx_path, live_preview=live_preview)
                         except Exception as e:
                             st.error(f"❌ Error during head gesture control: {e}")
                         finally:
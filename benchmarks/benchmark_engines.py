@@ -0,0 +1,97 @@
+"""Compare the synchronous FaceMesh engine with the asynchronous FaceLandmarker engine.
+
+Usage: python benchmarks/benchmark_engines.py [--source VIDEO_OR_CAMERA_INDEX] [--frames N]
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gesture_control.gesture import initialize_face_mesh
+from gesture_control.landmarker import initialize_face_landmarker, DEFAULT_MODEL_PATH
+from gesture_control.webcam import read_frame
+
+
+def open_source(source):
+    """Open a camera index or a video file."""
+    cap = cv2.VideoCapture(int(source) if source.isdigit() else source)
+    if not cap.isOpened():
+        raise RuntimeError(f"Could not open source: {source}")
+    return cap
+
+
+def run_engine(engine_name, engine, source, frames):
+    """Push frames through an engine and collect FPS and per-frame latency."""
+    cap = open_source(source)
+    blocking_times = []  # Time the frame loop spends inside process()
+    result_latencies = []  # Time from frame submission to landmarks being available
+    last_result_timestamp = None
+    processed = 0
+
+    start = time.perf_counter()
+    while processed < frames:
+        frame = read_frame(cap)
+        if frame is None:
+            break
+        capture_time = time.time()
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+        call_start = time.perf_counter()
+        if engine_name == "facemesh":
+            results = engine.process(rgb_frame)
+        else:
+            results = engine.process(rgb_frame, timestamp=capture_time)
+        blocking = time.perf_counter() - call_start
+        blocking_times.append(blocking)
+
+        if engine_name == "facemesh":
+            result_latencies.append(blocking)
+        elif results.timestamp is not None and results.timestamp != last_result_timestamp:
+            result_latencies.append(results.latency)
+            last_result_timestamp = results.timestamp
+        processed += 1
+    elapsed = time.perf_counter() - start
+    cap.release()
+
+    return {
+        'engine': engine_name,
+        'frames': processed,
+        'fps': processed / elapsed if elapsed > 0 else 0.0,
+        'results_per_second': len(result_latencies) / elapsed if elapsed > 0 else 0.0,
+        'blocking_ms': np.mean(blocking_times) * 1000 if blocking_times else 0.0,
+        'latency_p50_ms': np.percentile(result_latencies, 50) * 1000 if result_latencies else 0.0,
+        'latency_p95_ms': np.percentile(result_latencies, 95) * 1000 if result_latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FaceMesh vs FaceLandmarker inference")
+    parser.add_argument("--source", default="0", help="Camera index or video file")
+    parser.add_argument("--frames", type=int, default=300, help="Frames per engine")
+    parser.add_argument("--model-path", default=DEFAULT_MODEL_PATH, help="FaceLandmarker .task model file")
+    args = parser.parse_args()
+
+    results = []
+    _, face_mesh = initialize_face_mesh()
+    results.append(run_engine("facemesh", face_mesh, args.source, args.frames))
+    face_mesh.close()
+
+    _, face_landmarker = initialize_face_landmarker(args.model_path)
+    results.append(run_engine("landmarker", face_landmarker, args.source, args.frames))
+    face_landmarker.close()
+
+    print("\nInference Engine Benchmark")
+    print("| Engine     | Frames | Loop FPS | Results/s | Blocking (ms) | Latency p50 (ms) | Latency p95 (ms) |")
+    print("|------------|--------|----------|-----------|---------------|------------------|------------------|")
+    for r in results:
+        print(f"| {r['engine']:10} | {r['frames']:>6} | {r['fps']:>8.1f} | {r['results_per_second']:>9.1f} | "
+              f"{r['blocking_ms']:>13.2f} | {r['latency_p50_ms']:>16.2f} | {r['latency_p95_ms']:>16.2f} |")
+
+
+if __name__ == "__main__":
+    main()
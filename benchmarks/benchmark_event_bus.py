@@ -0,0 +1,86 @@
+"""Measure publish-to-receive latency of the gesture event bus with many subscribers.
+
+Usage: python benchmarks/benchmark_event_bus.py [--subscribers 48] [--events 500] [--rate 100]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gesture_control.events import GestureEventPublisher, GestureEventSubscriber, DEFAULT_EVENT_HOST
+
+
+def subscriber_loop(subscriber, received, stop):
+    """Record when each event sequence number arrives."""
+    while not stop.is_set():
+        event = subscriber.receive(timeout=0.1)
+        if event is not None:
+            received[event['seq']] = time.perf_counter()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the gesture event bus")
+    parser.add_argument("--subscribers", type=int, default=48)
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--rate", type=float, default=100.0, help="Events published per second")
+    parser.add_argument("--port", type=int, default=0, help="UDP port (0 picks a free one)")
+    args = parser.parse_args()
+
+    publisher = GestureEventPublisher(DEFAULT_EVENT_HOST, args.port)
+    port = publisher.address[1]
+    stop = threading.Event()
+    subscribers = []
+    threads = []
+    for _ in range(args.subscribers):
+        subscriber = GestureEventSubscriber(DEFAULT_EVENT_HOST, port)
+        received = {}
+        thread = threading.Thread(target=subscriber_loop, args=(subscriber, received, stop), daemon=True)
+        thread.start()
+        subscribers.append((subscriber, received))
+        threads.append(thread)
+
+    # Give the publisher thread time to register every subscriber
+    deadline = time.monotonic() + 2.0
+    while len(publisher.subscribers) < args.subscribers and time.monotonic() < deadline:
+        time.sleep(0.01)
+    print(f"{len(publisher.subscribers)}/{args.subscribers} subscribers registered on port {port}")
+
+    published = {}
+    publish_costs = []
+    interval = 1.0 / args.rate
+    for seq in range(1, args.events + 1):
+        start = time.perf_counter()
+        publisher.publish("tilt_right", 17.5, 0.58, time.time())
+        publish_costs.append(time.perf_counter() - start)
+        published[seq] = start
+        time.sleep(max(0.0, interval - (time.perf_counter() - start)))
+
+    time.sleep(0.5)
+    stop.set()
+    for thread in threads:
+        thread.join(timeout=1.0)
+    for subscriber, _ in subscribers:
+        subscriber.close()
+    publisher.close()
+
+    latencies = [(arrival - published[seq]) * 1000
+                 for _, received in subscribers for seq, arrival in received.items() if seq in published]
+    expected = args.events * args.subscribers
+    print("\nGesture Event Bus Benchmark")
+    print(f"Subscribers: {args.subscribers}, events: {args.events} at {args.rate:.0f}/s")
+    print(f"publish() cost: mean {np.mean(publish_costs) * 1e6:.1f}us, max {np.max(publish_costs) * 1e6:.1f}us")
+    if latencies:
+        print(f"Publish-to-receive latency: p50 {np.percentile(latencies, 50):.3f}ms, "
+              f"p95 {np.percentile(latencies, 95):.3f}ms, p99 {np.percentile(latencies, 99):.3f}ms, "
+              f"max {np.max(latencies):.3f}ms")
+    print(f"Delivered: {len(latencies)}/{expected} ({len(latencies) / expected:.1%}), "
+          f"dropped at publisher: {publisher.dropped}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+"""Reproducible pipeline benchmark over a matrix of pipeline settings.
+
+Pushes every video in the fixtures directory through the real gesture_control
+pipeline (preprocessing, Face Mesh, head pose and gesture detection) for each
+combination of resolution x model profile x frame skip x preprocessing, headless
+and against a simulated slideshow. Results are written in the schemas of the
+notebook's optimization_experiments.csv and mediapipe_performance_analysis.csv,
+next to a machine.json describing the hardware and software they came from.
+
+Fixture names starting with a lighting condition (e.g. low_light_walkthrough.mp4)
+are tracked under that condition. An optional <fixture>.gt.json file holding
+[{"time": seconds, "gesture": "tilt_right"}, ...] supplies ground truth. When
+the default fixtures directory holds no videos, the reference fixture from
+make_fixtures.py is generated there first. machine.json records the size and
+SHA-256 of every fixture, so results are only compared on identical inputs.
+
+Usage: python benchmarks/benchmark_matrix.py --fixtures benchmarks/fixtures
+"""
+import argparse
+import csv
+import glob
+import hashlib
+import itertools
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mediapipe as mp
+
+from gesture_control import gesture
+from gesture_control.gesture import initialize_face_mesh, process_gestures, set_condition, set_clock, record_ground_truth, reset_gesture_state
+from gesture_control.webcam import preprocess_frame
+from benchmarks.simulation import SimulatedClock, SimulatedPowerPoint, CONDITIONS
+from benchmarks.make_fixtures import generate_reference_fixture, DEFAULT_FIXTURES_DIR
+
+RESOLUTION_NAMES = {(640, 480): "Low", (1280, 720): "High"}
+MODEL_PROFILES = {
+    "Lite": {'refine_landmarks': False, 'landmarks_count': 468},
+    "Full": {'refine_landmarks': True, 'landmarks_count': 478},
+}
+PREPROCESSING = {
+    "raw": {'mirror': False, 'enhance_contrast': False},
+    "mirror": {'mirror': True, 'enhance_contrast': False},
+    "mirror_contrast": {'mirror': True, 'enhance_contrast': True},
+}
+# The production pipeline; optimization_gain and accuracy_impact are measured against it
+BASELINE = ((1280, 720), "Full", 1, "mirror_contrast")
+
+OPTIMIZATION_FIELDS = ['experiment', 'resolution', 'model_complexity', 'frame_skip', 'fps',
+                       'processing_time_ms', 'accuracy_impact', 'optimization_gain']
+PERFORMANCE_FIELDS = ['method', 'fps', 'detection_confidence', 'processing_time_ms', 'landmarks_count',
+                      'accuracy_rate', 'use_case', 'latency_range', 'lighting_conditions', 'efficiency_score']
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv')
+
+
+def parse_resolution(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def experiment_name(resolution, profile, frame_skip, preprocessing):
+    res_name = RESOLUTION_NAMES.get(resolution, f"{resolution[0]}x{resolution[1]}")
+    name = f"{res_name}_{profile}_Skip{frame_skip}"
+    # The default preprocessing keeps the notebook's experiment names
+    return name if preprocessing == "mirror_contrast" else f"{name}_{preprocessing}"
+
+
+def fixture_condition(path):
+    """Lighting condition encoded in the fixture file name, defaulting to optimal."""
+    name = os.path.basename(path)
+    for cond in CONDITIONS:
+        if name.startswith(cond):
+            return cond
+    return "optimal"
+
+
+def load_ground_truth(path):
+    gt_path = os.path.splitext(path)[0] + ".gt.json"
+    if not os.path.exists(gt_path):
+        return []
+    with open(gt_path) as f:
+        return sorted(json.load(f), key=lambda gt: gt['time'])
+
+
+def run_fixture(path, resolution, face_mesh, frame_skip, preprocessing, clock, powerpoint, max_frames):
+    """Run one fixture through the pipeline; return per-frame processing times and detections."""
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise RuntimeError(f"Could not open fixture: {path}")
+    video_fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    ground_truth = load_ground_truth(path)
+    set_condition(fixture_condition(path))
+    start_time = clock.time()
+
+    processing_times = []
+    detections = 0
+    frame_count = 0
+    while max_frames is None or frame_count < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frame_count += 1
+        # Gesture timing follows the video timeline, not how fast this machine decodes it
+        clock.now = start_time + frame_count / video_fps
+        while ground_truth and ground_truth[0]['time'] <= frame_count / video_fps:
+            record_ground_truth(ground_truth.pop(0)['gesture'])
+
+        if frame_count % frame_skip != 0:
+            continue
+        if (frame.shape[1], frame.shape[0]) != resolution:
+            frame = cv2.resize(frame, resolution, interpolation=cv2.INTER_AREA)
+        frame = preprocess_frame(frame, **PREPROCESSING[preprocessing])
+
+        process_start = time.perf_counter()
+        _, head_detected, _, _ = process_gestures(
+            frame, face_mesh, mp.solutions.drawing_utils, mp.solutions.face_mesh, powerpoint, clock.time()
+        )
+        processing_times.append(time.perf_counter() - process_start)
+        if head_detected:
+            detections += 1
+    cap.release()
+    return processing_times, detections
+
+
+def compare_events(reference, events, window=1.0):
+    """Match events to reference (timestamp, gesture) pairs; return delays of matches, missed and extra counts."""
+    unmatched = list(events)
+    delays = []
+    missed = 0
+    for timestamp, name in reference:
+        candidates = [e for e in unmatched if e[1] == name and abs(e[0] - timestamp) <= window]
+        if not candidates:
+            missed += 1
+            continue
+        match = min(candidates, key=lambda e: abs(e[0] - timestamp))
+        unmatched.remove(match)
+        delays.append(match[0] - timestamp)
+    return delays, missed, len(unmatched)
+
+
+def gesture_agreement(reference, events):
+    """Fraction of gestures detected the same way as in the reference run (1.0 when both are empty)."""
+    if not reference and not events:
+        return 1.0
+    delays, _, _ = compare_events(reference, events)
+    return len(delays) / max(len(reference), len(events))
+
+
+def run_experiment(fixtures, resolution, profile, frame_skip, preprocessing, max_frames):
+    """Run every fixture under one configuration and summarise it."""
+    reset_gesture_state()
+    clock = SimulatedClock()
+    set_clock(clock.time)
+    powerpoint = SimulatedPowerPoint()
+    _, face_mesh = initialize_face_mesh(refine_landmarks=MODEL_PROFILES[profile]['refine_landmarks'])
+
+    processing_times = []
+    detections = 0
+    wall_start = time.perf_counter()
+    try:
+        for path in fixtures:
+            times, detected = run_fixture(path, resolution, face_mesh, frame_skip, preprocessing,
+                                          clock, powerpoint, max_frames)
+            processing_times.extend(times)
+            detections += detected
+    finally:
+        face_mesh.close()
+        set_clock(time.time)
+    wall_time = time.perf_counter() - wall_start
+
+    gestures = [d for data in gesture.performance_data.values() for d in data]
+    events = sorted((d['timestamp'], d['gesture']) for d in gestures)
+    latencies = [d['latency'] * 1000 for d in gestures]
+    processed = len(processing_times)
+    return {
+        'experiment': experiment_name(resolution, profile, frame_skip, preprocessing),
+        'resolution': f"{resolution[0]}x{resolution[1]}",
+        'model_complexity': profile,
+        'frame_skip': frame_skip,
+        'preprocessing': preprocessing,
+        'fps': processed / wall_time if wall_time > 0 else 0.0,
+        'processing_time_ms': float(np.mean(processing_times)) * 1000 if processing_times else 0.0,
+        'detection_rate': detections / processed if processed else 0.0,
+        'accuracy_rate': sum(1 for d in gestures if d['correct']) / len(gestures) if gestures else 0.0,
+        'landmarks_count': MODEL_PROFILES[profile]['landmarks_count'],
+        'latency_range': f"{min(latencies):.1f}-{max(latencies):.1f}ms" if latencies else "0-0ms",
+        'lighting_conditions': [cond for cond in CONDITIONS if gesture.performance_data.get(cond)],
+        'gestures': len(gestures),
+        'events': events,
+    }
+
+
+def fixture_metadata(path):
+    """Name, size and SHA-256 of a fixture, identifying the exact recording a result came from."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return {'name': os.path.basename(path), 'bytes': os.path.getsize(path), 'sha256': digest.hexdigest()}
+
+
+def find_fixtures(directory):
+    return sorted(path for path in glob.glob(os.path.join(directory, "*"))
+                  if path.lower().endswith(VIDEO_EXTENSIONS))
+
+
+def machine_metadata(args, fixtures):
+    """Describe the machine and software the benchmark ran on."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except Exception:
+        commit = ""
+    return {
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        'hostname': socket.gethostname(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'opencv': cv2.__version__,
+        'mediapipe': getattr(mp, '__version__', 'unknown'),
+        'numpy': np.__version__,
+        'git_commit': commit,
+        'fixtures': [fixture_metadata(path) for path in fixtures],
+        'max_frames_per_fixture': args.max_frames,
+        'matrix': {
+            'resolutions': args.resolutions,
+            'profiles': args.profiles,
+            'frame_skips': args.frame_skips,
+            'preprocessing': args.preprocessing,
+        },
+    }
+
+
+def write_results(output_dir, results, metadata):
+    os.makedirs(output_dir, exist_ok=True)
+    baseline = next(r for r in results if r['experiment'] == experiment_name(*BASELINE))
+    baseline_fps = baseline['fps']
+
+    with open(os.path.join(output_dir, "optimization_experiments.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=OPTIMIZATION_FIELDS)
+        writer.writeheader()
+        for r in results:
+            writer.writerow({
+                'experiment': r['experiment'],
+                'resolution': r['resolution'],
+                'model_complexity': r['model_complexity'],
+                'frame_skip': r['frame_skip'],
+                'fps': r['fps'],
+                'processing_time_ms': r['processing_time_ms'],
+                'accuracy_impact': gesture_agreement(baseline['events'], r['events']),
+                'optimization_gain': (r['fps'] - baseline_fps) / baseline_fps * 100 if baseline_fps > 0 else 0,
+            })
+
+    with open(os.path.join(output_dir, "mediapipe_performance_analysis.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=PERFORMANCE_FIELDS)
+        writer.writeheader()
+        for r in results:
+            writer.writerow({
+                'method': f"Head Gesture ({r['experiment']})",
+                'fps': r['fps'],
+                'detection_confidence': r['detection_rate'],  # Share of processed frames with a face, as in the notebook
+                'processing_time_ms': r['processing_time_ms'],
+                'landmarks_count': r['landmarks_count'],
+                'accuracy_rate': r['accuracy_rate'],
+                'use_case': "PowerPoint Control (Benchmark)",
+                'latency_range': r['latency_range'],
+                'lighting_conditions': str(r['lighting_conditions']),
+                'efficiency_score': r['fps'] / r['processing_time_ms'] if r['processing_time_ms'] > 0 else 0.0,
+            })
+
+    with open(os.path.join(output_dir, "machine.json"), "w") as f:
+        json.dump(metadata, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the gesture pipeline over a settings matrix")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES_DIR,
+                        help="Directory of video fixtures (the default one gets the reference fixture if empty)")
+    parser.add_argument("--output-dir", default=None,
+                        help="Where to write the CSVs (default: benchmarks/results/<host>_<time>)")
+    parser.add_argument("--resolutions", default="640x480,1280x720")
+    parser.add_argument("--profiles", default="Lite,Full", help=f"Any of {','.join(MODEL_PROFILES)}")
+    parser.add_argument("--frame-skips", default="1,2,3")
+    parser.add_argument("--preprocessing", default=",".join(PREPROCESSING), help=f"Any of {','.join(PREPROCESSING)}")
+    parser.add_argument("--max-frames", type=int, default=None, help="Frames to read from each fixture")
+    args = parser.parse_args()
+
+    fixtures = find_fixtures(args.fixtures)
+    if not fixtures and os.path.abspath(args.fixtures) == DEFAULT_FIXTURES_DIR:
+        generate_reference_fixture(args.fixtures)
+        fixtures = find_fixtures(args.fixtures)
+    if not fixtures:
+        print(f"Error: No video fixtures found in {args.fixtures}")
+        sys.exit(1)
+
+    resolutions = [parse_resolution(r) for r in args.resolutions.split(",")]
+    profiles = args.profiles.split(",")
+    frame_skips = [int(skip) for skip in args.frame_skips.split(",")]
+    preprocessing_options = args.preprocessing.split(",")
+    for profile in profiles:
+        if profile not in MODEL_PROFILES:
+            parser.error(f"Unknown profile: {profile}")
+    for option in preprocessing_options:
+        if option not in PREPROCESSING:
+            parser.error(f"Unknown preprocessing option: {option}")
+
+    output_dir = args.output_dir or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "results",
+        f"{socket.gethostname()}_{time.strftime('%Y%m%d_%H%M%S')}"
+    )
+
+    results = []
+    matrix = list(itertools.product(resolutions, profiles, frame_skips, preprocessing_options))
+    if BASELINE not in matrix:
+        matrix.insert(0, BASELINE)  # Every experiment is compared against the production pipeline
+    print(f"Running {len(matrix)} experiments over {len(fixtures)} fixtures")
+    for resolution, profile, frame_skip, preprocessing in matrix:
+        result = run_experiment(fixtures, resolution, profile, frame_skip, preprocessing, args.max_frames)
+        results.append(result)
+        print(f"{result['experiment']:32} FPS {result['fps']:6.2f} | processing {result['processing_time_ms']:6.2f}ms | "
+              f"detection {result['detection_rate']:.0%} | gestures {result['gestures']}")
+
+    write_results(output_dir, results, machine_metadata(args, fixtures))
+    print(f"Results written to {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
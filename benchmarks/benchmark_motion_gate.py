@@ -0,0 +1,153 @@
+"""Compare the pipeline with and without motion gating on the same input.
+
+Reports the fraction of frames that skipped Face Mesh, the processing time per
+frame, and how much later (in video time) each gesture is detected with gating
+on, so gating can be checked not to delay gesture detection.
+
+Input is either the video fixtures, or with --synthetic a rendered head (with
+sensor noise over a textured background) following the soak test's gesture
+script, whose landmarks come from the scripted roll. Synthetic landmarks cost
+nothing to compute, so that mode measures skipped frames and added delay, not
+processing time.
+
+Usage: python benchmarks/benchmark_motion_gate.py --fixtures benchmarks/fixtures [--threshold 2.0] [--max-age 0.25]
+       python benchmarks/benchmark_motion_gate.py --synthetic [--seconds 60]
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mediapipe as mp
+
+from gesture_control import gesture
+from gesture_control.gesture import initialize_face_mesh, configure_motion_gate, reset_gesture_state, set_clock, process_gestures
+from benchmarks.benchmark_matrix import run_fixture, compare_events, parse_resolution, find_fixtures
+from benchmarks.make_fixtures import generate_reference_fixture, DEFAULT_FIXTURES_DIR
+from benchmarks.simulation import SimulatedClock, SimulatedPowerPoint
+from benchmarks.soak_test import RampedFaceMesh
+
+
+def run_mode(fixtures, resolution, threshold, max_age, max_frames):
+    """Run all fixtures with gating set to threshold (None disables it)."""
+    reset_gesture_state()
+    configure_motion_gate(threshold, max_age)
+    clock = SimulatedClock()
+    set_clock(clock.time)
+    _, face_mesh = initialize_face_mesh()
+    processing_times = []
+    try:
+        for path in fixtures:
+            times, _ = run_fixture(path, resolution, face_mesh, 1, "mirror_contrast",
+                                   clock, SimulatedPowerPoint(), max_frames)
+            processing_times.extend(times)
+    finally:
+        face_mesh.close()
+        set_clock(time.time)
+        configure_motion_gate(None)
+    return summarize(processing_times)
+
+
+def render_face(landmarks, background, noise):
+    """Draw a head matching the landmarks over the background, plus sensor noise."""
+    frame = background.copy()
+    h, w = frame.shape[:2]
+    points = np.array([(lm.x * w, lm.y * h) for lm in landmarks.landmark], dtype=np.int32)
+    cv2.fillConvexPoly(frame, cv2.convexHull(points), (140, 170, 210))
+    for idx in (33, 263):  # Eye corners
+        cv2.circle(frame, (int(points[idx][0]), int(points[idx][1])), 12, (40, 40, 40), -1)
+    cv2.circle(frame, (int(points[1][0]), int(points[1][1])), 9, (90, 110, 160), -1)  # Nose tip
+    cv2.add(frame, noise, dst=frame)
+    return frame
+
+
+def run_synthetic(threshold, max_age, seconds, ramp, fps=30.0, size=(1280, 720)):
+    """Run the rendered gesture script with gating set to threshold (None disables it)."""
+    reset_gesture_state()
+    configure_motion_gate(threshold, max_age)
+    clock = SimulatedClock()
+    set_clock(clock.time)
+    face_mesh = RampedFaceMesh(clock, ramp=ramp, aspect=size[0] / size[1])
+    powerpoint = SimulatedPowerPoint()
+    rng = np.random.default_rng(0)
+    background = cv2.GaussianBlur(rng.integers(40, 200, (size[1], size[0], 3), dtype=np.uint8), (0, 0), 3)
+    noise = [rng.integers(0, 6, background.shape, dtype=np.uint8) for _ in range(4)]
+    processing_times = []
+    try:
+        for frame_idx in range(int(seconds * fps)):
+            landmarks = face_mesh.landmarks_for(face_mesh.roll_at(clock.time()))
+            frame = render_face(landmarks, background, noise[frame_idx % len(noise)])
+            process_start = time.perf_counter()
+            process_gestures(frame, face_mesh, mp.solutions.drawing_utils, mp.solutions.face_mesh,
+                             powerpoint, clock.time())
+            processing_times.append(time.perf_counter() - process_start)
+            clock.advance(1.0 / fps)
+    finally:
+        set_clock(time.time)
+        configure_motion_gate(None)
+    return summarize(processing_times)
+
+
+def summarize(processing_times):
+    """Gestures detected and gate statistics of the run that just finished."""
+    events = sorted((d['timestamp'], d['gesture']) for data in gesture.performance_data.values() for d in data)
+    total = gesture.motion_gate_stats['inferred'] + gesture.motion_gate_stats['reused']
+    return {
+        'events': events,
+        'skipped': gesture.motion_gate_stats['reused'] / total if total else 0.0,
+        'processing_ms': float(np.mean(processing_times)) * 1000 if processing_times else 0.0,
+        'processing_p95_ms': float(np.percentile(processing_times, 95)) * 1000 if processing_times else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark motion-gated inference")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES_DIR)
+    parser.add_argument("--resolution", default="1280x720")
+    parser.add_argument("--threshold", type=float, default=2.0)
+    parser.add_argument("--max-age", type=float, default=0.25)
+    parser.add_argument("--max-frames", type=int, default=None, help="Frames to read from each fixture")
+    parser.add_argument("--synthetic", action="store_true", help="Use a rendered head instead of the video fixtures")
+    parser.add_argument("--seconds", type=float, default=60.0, help="Simulated seconds of the synthetic run")
+    parser.add_argument("--ramp", type=float, default=0.3, help="Seconds the synthetic head takes to tilt")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        source = f"synthetic, {args.seconds:.0f}s, {args.ramp}s tilt ramp"
+        baseline = run_synthetic(None, args.max_age, args.seconds, args.ramp)
+        gated = run_synthetic(args.threshold, args.max_age, args.seconds, args.ramp)
+    else:
+        fixtures = find_fixtures(args.fixtures)
+        if not fixtures and os.path.abspath(args.fixtures) == DEFAULT_FIXTURES_DIR:
+            generate_reference_fixture(args.fixtures)
+            fixtures = find_fixtures(args.fixtures)
+        if not fixtures:
+            print(f"Error: No video fixtures found in {args.fixtures}")
+            sys.exit(1)
+        resolution = parse_resolution(args.resolution)
+        source = f"{len(fixtures)} fixtures"
+        baseline = run_mode(fixtures, resolution, None, args.max_age, args.max_frames)
+        gated = run_mode(fixtures, resolution, args.threshold, args.max_age, args.max_frames)
+    delays, missed, extra = compare_events(baseline['events'], gated['events'])
+
+    print("\nMotion Gate Benchmark")
+    print(f"Input: {source}, threshold {args.threshold}, max reuse age {args.max_age}s")
+    print(f"Frames skipping Face Mesh: {gated['skipped']:.1%}")
+    print(f"Processing per frame: {baseline['processing_ms']:.2f}ms -> {gated['processing_ms']:.2f}ms "
+          f"(p95 {baseline['processing_p95_ms']:.2f}ms -> {gated['processing_p95_ms']:.2f}ms)")
+    print(f"Gestures: {len(baseline['events'])} ungated, {len(gated['events'])} gated "
+          f"({missed} missed, {extra} extra)")
+    if delays:
+        print(f"Added detection delay (video time): mean {np.mean(delays) * 1000:+.1f}ms, "
+              f"max {np.max(delays) * 1000:+.1f}ms")
+    if missed or (delays and np.max(delays) > 0):
+        print("WARNING: gating changed gesture detection, lower --threshold or --max-age")
+
+
+if __name__ == "__main__":
+    main()
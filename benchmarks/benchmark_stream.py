@@ -0,0 +1,111 @@
+"""Measure what the live MJPEG preview stream costs the frame loop.
+
+Runs the production frame loop step (run_frame) on synthetic 1280x720 input at
+the camera frame rate, once without the stream and once with it serving a
+connected viewer, and compares per-frame latency. Synthetic landmarks cost
+nothing to compute, so any added time shows up undiluted by inference.
+
+Usage: python benchmarks/benchmark_stream.py [--frames 600] [--fps 30] [--stream-fps 10]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+import urllib.request
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mediapipe as mp
+
+from gesture_control.gesture import reset_gesture_state, set_clock
+from gesture_control.pipeline import run_frame
+from gesture_control.profiler import FrameProfiler
+from gesture_control.stream import PreviewStreamer, DEFAULT_STREAM_HOST
+from benchmarks.simulation import SimulatedClock, SimulatedPowerPoint
+from benchmarks.soak_test import SyntheticFaceMesh, SyntheticSource
+
+
+def watch_stream(port, stop, received):
+    """Read the MJPEG stream like a browser would, counting the bytes received."""
+    with urllib.request.urlopen(f"http://{DEFAULT_STREAM_HOST}:{port}/stream.mjpg", timeout=5) as response:
+        while not stop.is_set():
+            chunk = response.read(65536)
+            if not chunk:
+                break
+            received[0] += len(chunk)
+
+
+def run_mode(frames, fps, stream_fps, stream_width):
+    """Run the frame loop with the stream off (stream_fps=None) or on with one viewer."""
+    reset_gesture_state()
+    clock = SimulatedClock()
+    set_clock(clock.time)
+    source = SyntheticSource()
+    face_mesh = SyntheticFaceMesh(clock)
+    powerpoint = SimulatedPowerPoint()
+    profiler = FrameProfiler()
+    streamer = None
+    stop = threading.Event()
+    received = [0]
+    viewer = None
+    if stream_fps:
+        streamer = PreviewStreamer(DEFAULT_STREAM_HOST, 0, max_fps=stream_fps, width=stream_width)
+        viewer = threading.Thread(target=watch_stream, args=(streamer.address[1], stop, received), daemon=True)
+        viewer.start()
+
+    latencies = []
+    loop_state = {}
+    try:
+        for _ in range(frames):
+            frame_start = time.perf_counter()
+            run_frame(source, face_mesh, mp.solutions.drawing_utils, mp.solutions.face_mesh, powerpoint,
+                      profiler, None, streamer, loop_state)
+            elapsed = time.perf_counter() - frame_start
+            latencies.append(elapsed)
+            clock.advance(1.0 / fps)
+            time.sleep(max(0.0, 1.0 / fps - elapsed))
+    finally:
+        set_clock(time.time)
+        stop.set()
+        encoded = streamer.encoded_frames if streamer else 0
+        if streamer:
+            streamer.close()
+        if viewer:
+            viewer.join(timeout=1.0)
+
+    if len(latencies) > fps:
+        latencies = latencies[fps:]  # Skip the first second of warm-up
+    latencies = np.array(latencies) * 1000
+    return {
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p95_ms': float(np.percentile(latencies, 95)),
+        'p99_ms': float(np.percentile(latencies, 99)),
+        'mean_ms': float(latencies.mean()),
+        'encoded': encoded,
+        'received_kb': received[0] / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the live preview stream's cost to the frame loop")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--fps", type=int, default=30, help="Camera frame rate the loop is paced at")
+    parser.add_argument("--stream-fps", type=float, default=10.0)
+    parser.add_argument("--stream-width", type=int, default=640)
+    args = parser.parse_args()
+
+    off = run_mode(args.frames, args.fps, None, args.stream_width)
+    on = run_mode(args.frames, args.fps, args.stream_fps, args.stream_width)
+
+    print("\nPreview Stream Benchmark")
+    print(f"Frames: {args.frames} at {args.fps} FPS, stream {args.stream_fps:.0f} FPS at {args.stream_width}px wide")
+    for key in ('mean_ms', 'p50_ms', 'p95_ms', 'p99_ms'):
+        print(f"Frame loop {key[:-3]:4}: {off[key]:.2f}ms off -> {on[key]:.2f}ms on ({on[key] - off[key]:+.2f}ms)")
+    print(f"Stream: {on['encoded']} frames encoded, {on['received_kb']:.0f}KB received by the viewer")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Generate the reference video fixture the benchmark matrix runs on by default.
+
+Renders one cycle of the soak test's gesture script (tilt right, tilt left,
+triple tilt) as a cartoon head with sensor noise, and writes it with its
+ground truth file. Output is deterministic for a given OpenCV build; the
+benchmark records each fixture's SHA-256 so results from different fixtures
+are not compared by mistake.
+
+Usage: python benchmarks/make_fixtures.py [--output benchmarks/fixtures]
+"""
+import argparse
+import json
+import os
+import sys
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.simulation import SimulatedClock, render_head
+from benchmarks.soak_test import RampedFaceMesh, GESTURE_SCRIPT, GESTURE_SCRIPT_PERIOD
+
+DEFAULT_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+REFERENCE_FIXTURE = "optimal_reference_head.mp4"
+
+
+def generate_reference_fixture(output_dir=DEFAULT_FIXTURES_DIR, fps=30, size=(1280, 720), ramp=0.2):
+    """Write the reference fixture and its .gt.json to output_dir; return the video path."""
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, REFERENCE_FIXTURE)
+    script = RampedFaceMesh(SimulatedClock(0.0), ramp=ramp)
+    rng = np.random.default_rng(0)
+    background = cv2.GaussianBlur(rng.integers(60, 180, (size[1], size[0], 3), dtype=np.uint8), (0, 0), 3)
+
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, size)
+    if not writer.isOpened():
+        raise RuntimeError(f"Could not write fixture: {path}")
+    try:
+        for frame_idx in range(int(GESTURE_SCRIPT_PERIOD * fps)):
+            frame = render_head(script.roll_at(frame_idx / fps), background)
+            cv2.add(frame, rng.integers(0, 6, frame.shape, dtype=np.uint8), dst=frame)
+            writer.write(frame)
+    finally:
+        writer.release()
+
+    # A triple tilt is detected on its last tilt, which is where the script puts its ground truth
+    ground_truth = [{'time': start, 'gesture': expected} for start, _, _, expected in GESTURE_SCRIPT if expected]
+    with open(os.path.splitext(path)[0] + ".gt.json", "w") as f:
+        json.dump(ground_truth, f, indent=2)
+    print(f"Reference fixture written to {path}")
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the reference benchmark fixture")
+    parser.add_argument("--output", default=DEFAULT_FIXTURES_DIR, help="Fixtures directory")
+    args = parser.parse_args()
+    generate_reference_fixture(args.output)
+
+
+if __name__ == "__main__":
+    main()
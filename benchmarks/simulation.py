@@ -0,0 +1,90 @@
+"""Simulated time, PowerPoint and camera input shared by the benchmarks, so they run headless on any OS."""
+import cv2
+import numpy as np
+
+CONDITIONS = ["optimal", "low_light", "backlit", "artificial", "natural"]
+
+
+class SimulatedClock:
+    """Simulated time for gesture.set_clock(), so hours pass in minutes."""
+
+    def __init__(self, start=1_000_000.0):
+        self.now = start
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class SimulatedSlideshowView:
+    """Slideshow view that counts navigation calls instead of driving PowerPoint."""
+
+    def __init__(self, slideshow):
+        self.slideshow = slideshow
+
+    def Next(self):
+        self.slideshow.slide += 1
+        self.slideshow.actions["next"] += 1
+
+    def Previous(self):
+        self.slideshow.slide = max(1, self.slideshow.slide - 1)
+        self.slideshow.actions["previous"] += 1
+
+    def Exit(self):
+        self.slideshow.actions["exit"] += 1  # Keep the show running for the rest of the soak
+
+
+class SimulatedSlideshowWindows:
+    """Mimics powerpoint.SlideShowWindows: has .Count and is callable with an index."""
+
+    def __init__(self):
+        self.Count = 1
+        self.slide = 1
+        self.actions = {"next": 0, "previous": 0, "exit": 0}
+        self.View = SimulatedSlideshowView(self)
+
+    def __call__(self, index):
+        return self  # The single slideshow window exposes .View itself
+
+
+class SimulatedPowerPoint:
+    """Minimal PowerPoint COM object accepted by safe_slideshow_control."""
+
+    def __init__(self):
+        self.SlideShowWindows = SimulatedSlideshowWindows()
+
+
+def render_head(roll, background, scale=1.0):
+    """Draw a cartoon head rolled by `roll` degrees in the middle of a copy of background.
+
+    The drawing is simple, but real Face Mesh detects it and measures its roll,
+    so it can stand in for a recorded session.
+    """
+    frame = background.copy()
+    h, w = frame.shape[:2]
+    cx, cy = w // 2, h // 2
+    head = np.zeros_like(frame)
+    mask = np.zeros((h, w), dtype=np.uint8)
+
+    def size(value):
+        return int(value * scale)
+
+    cv2.ellipse(head, (cx, cy - size(40)), (size(150), size(190)), 0, 180, 360, (30, 40, 60), -1)  # Hair
+    cv2.ellipse(head, (cx, cy), (size(130), size(170)), 0, 0, 360, (120, 150, 200), -1)  # Skin
+    for dx in (-size(50), size(50)):
+        cv2.ellipse(head, (cx + dx, cy - size(30)), (size(28), size(14)), 0, 0, 360, (240, 240, 240), -1)
+        cv2.circle(head, (cx + dx, cy - size(30)), size(10), (50, 30, 20), -1)
+        cv2.line(head, (cx + dx - size(30), cy - size(65)), (cx + dx + size(30), cy - size(65)), (40, 40, 60), size(8))
+    cv2.line(head, (cx, cy - size(20)), (cx - size(12), cy + size(35)), (90, 110, 160), size(6))  # Nose
+    cv2.ellipse(head, (cx, cy + size(80)), (size(50), size(18)), 0, 0, 180, (60, 60, 150), size(8))  # Mouth
+    cv2.ellipse(mask, (cx, cy - size(40)), (size(150), size(190)), 0, 180, 360, 255, -1)
+    cv2.ellipse(mask, (cx, cy), (size(130), size(170)), 0, 0, 360, 255, -1)
+
+    # The frame is the unmirrored camera view; after the pipeline mirrors it, Face Mesh measures +roll
+    rotation = cv2.getRotationMatrix2D((cx, cy), roll, 1.0)
+    head = cv2.warpAffine(head, rotation, (w, h))
+    mask = cv2.warpAffine(mask, rotation, (w, h))
+    frame[mask > 0] = head[mask > 0]
+    return frame
@@ -0,0 +1,338 @@
+"""Long-session soak test for memory and latency drift in the gesture pipeline.
+
+Drives the production frame loop (capture and preprocessing, gestures,
+optional preview ring buffer and MJPEG stream, profiler marks) for hours of
+simulated time against a simulated slideshow, sampling RSS and per-frame
+latency along the way. tracemalloc only runs for a short window before each
+sample, reporting which allocations from that window are still alive, so it
+does not distort the latency figures. Exits with status 1 when RSS or p99
+latency trend upward beyond the configured budget, or when the run is too
+short to measure a trend.
+
+Usage: python benchmarks/soak_test.py [--hours 4] [--video recording.mp4] [--preview] [--stream-port 8765]
+"""
+import argparse
+import csv
+import math
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mediapipe as mp
+from mediapipe.framework.formats import landmark_pb2
+
+from gesture_control.gesture import initialize_face_mesh, set_condition, set_clock, record_ground_truth, analyze_performance
+from gesture_control.pipeline import run_frame
+from gesture_control.preview import FramePreview
+from gesture_control.profiler import FrameProfiler
+from gesture_control.stream import PreviewStreamer, DEFAULT_STREAM_HOST
+from benchmarks.simulation import SimulatedClock, SimulatedPowerPoint, CONDITIONS
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+FACE_LANDMARK_COUNT = 478
+
+# One cycle of synthetic head movement: (start, end, roll degrees, ground truth gesture)
+# A triple tilt is only detected on its third tilt, so that is where its ground truth goes
+GESTURE_SCRIPT_PERIOD = 20.0
+GESTURE_SCRIPT = [
+    (4.0, 4.6, 18.0, "tilt_right"),
+    (9.0, 9.6, -18.0, "tilt_left"),
+    (14.0, 14.3, 25.0, None),
+    (14.8, 15.1, 25.0, None),
+    (15.6, 15.9, 25.0, "triple_tilt"),
+]
+
+
+class SyntheticResults:
+    def __init__(self, multi_face_landmarks):
+        self.multi_face_landmarks = multi_face_landmarks
+
+
+class SyntheticFaceMesh:
+    """Returns FaceMesh-style landmarks following GESTURE_SCRIPT on the simulated clock."""
+
+    def __init__(self, clock, seed=0, aspect=1280 / 720):
+        self.clock = clock
+        self.aspect = aspect  # Frame width / height; rolls are applied in pixel space like calculate_head_pose
+        rng = random.Random(seed)
+        self.base = [(rng.uniform(-0.12, 0.12), rng.uniform(-0.15, 0.15)) for _ in range(FACE_LANDMARK_COUNT)]
+        self.base[1] = (0.0, 0.0)  # Nose tip
+        self.base[33] = (-0.08, -0.05)  # Left eye corner
+        self.base[263] = (0.08, -0.05)  # Right eye corner
+        self.cache = {}  # Whole-degree roll -> landmark list
+
+    def roll_at(self, t):
+        phase = t % GESTURE_SCRIPT_PERIOD
+        for start, end, roll, _ in GESTURE_SCRIPT:
+            if start <= phase < end:
+                return roll
+        return 2.0 * math.sin(t)  # Small idle sway
+
+    def landmarks_for(self, roll):
+        key = int(round(roll))
+        if key not in self.cache:
+            angle = math.radians(key)
+            cos_a, sin_a = math.cos(angle), math.sin(angle)
+            landmark_list = landmark_pb2.NormalizedLandmarkList()
+            landmark_list.landmark.extend(
+                landmark_pb2.NormalizedLandmark(x=0.5 + (x * self.aspect * cos_a - y * sin_a) / self.aspect,
+                                                y=0.5 + x * self.aspect * sin_a + y * cos_a, z=0.0)
+                for x, y in self.base
+            )
+            self.cache[key] = landmark_list
+        return self.cache[key]
+
+    def process(self, rgb_frame):
+        landmarks = self.landmarks_for(self.roll_at(self.clock.time()))
+        return SyntheticResults([landmarks])
+
+    def close(self):
+        pass
+
+
+class RampedFaceMesh(SyntheticFaceMesh):
+    """SyntheticFaceMesh whose head turns into and out of each scripted tilt over `ramp` seconds."""
+
+    def __init__(self, clock, ramp=0.3, **kwargs):
+        super().__init__(clock, **kwargs)
+        self.ramp = ramp
+
+    def roll_at(self, t):
+        phase = t % GESTURE_SCRIPT_PERIOD
+        for start, end, roll, _ in GESTURE_SCRIPT:
+            if start - self.ramp <= phase < start:
+                return roll * (phase - start + self.ramp) / self.ramp
+            if end <= phase < end + self.ramp:
+                return roll * (end + self.ramp - phase) / self.ramp
+        return super().roll_at(t)
+
+
+class SyntheticSource:
+    """Camera stand-in returning synthetic frames the same size as the webcam frames."""
+
+    def __init__(self, width=1280, height=720):
+        self.frame = np.full((height, width, 3), 96, dtype=np.uint8)
+
+    def read(self):
+        return True, self.frame  # read_frame preprocesses into a new buffer, so this one stays clean
+
+    def release(self):
+        pass
+
+
+class VideoSource:
+    """Camera stand-in looping a recorded video for as long as the soak runs."""
+
+    def __init__(self, path):
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"Could not open video: {path}")
+
+    def read(self):
+        ret, frame = self.cap.read()
+        if not ret:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        return ret, frame
+
+    def release(self):
+        self.cap.release()
+
+
+def read_rss_mb():
+    """Resident set size of this process in MB, or None when it cannot be read."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def trend(times, values):
+    """Growth over the whole run predicted by a least-squares line through the samples."""
+    if len(values) < 3:
+        return 0.0
+    slope = np.polyfit(times, values, 1)[0]
+    return slope * (times[-1] - times[0])
+
+
+def run_soak(args):
+    clock = SimulatedClock()
+    set_clock(clock.time)  # Gesture timing and ground truth now follow simulated time
+    powerpoint = SimulatedPowerPoint()
+    profiler = FrameProfiler(duration=args.profile_seconds, output_dir=args.profile_dir)
+    preview = FramePreview() if args.preview else None
+    streamer = None
+    if args.stream_port is not None:
+        streamer = PreviewStreamer(DEFAULT_STREAM_HOST, args.stream_port)
+    loop_state = {}
+
+    if args.video:
+        source = VideoSource(args.video)
+        mp_face_mesh, face_mesh = initialize_face_mesh()
+    else:
+        source = SyntheticSource()
+        mp_face_mesh, face_mesh = mp.solutions.face_mesh, SyntheticFaceMesh(clock)
+    mp_drawing = mp.solutions.drawing_utils
+
+    frame_interval = 1.0 / args.fps
+    total_frames = int(args.hours * 3600 * args.fps)
+    sample_frames = max(1, int(args.sample_minutes * 60 * args.fps))
+
+    # tracemalloc slows every allocation, so it only runs for the last trace_frames of each sample
+    # period; those frames are left out of the latency percentiles
+    trace_frames = min(args.trace_frames, sample_frames - 1)
+    samples = []
+    latencies = []
+
+    print(f"Soak test: {args.hours:.1f} simulated hours, {total_frames} frames, "
+          f"{'video ' + args.video if args.video else 'synthetic input'}")
+    wall_start = time.perf_counter()
+    try:
+        for frame_idx in range(total_frames):
+            set_condition(CONDITIONS[frame_idx // 200 % len(CONDITIONS)])
+            if not args.video:
+                # Simulate the operator pressing R/L/T as each scripted gesture starts
+                phase = clock.time() % GESTURE_SCRIPT_PERIOD
+                for start, _, _, expected in GESTURE_SCRIPT:
+                    if expected and start <= phase < start + frame_interval:
+                        record_ground_truth(expected)
+
+            tracing = trace_frames > 0 and frame_idx % sample_frames >= sample_frames - trace_frames
+            if tracing and not tracemalloc.is_tracing():
+                tracemalloc.start(args.trace_depth)
+            frame_start = time.perf_counter()
+            result = run_frame(source, face_mesh, mp_drawing, mp_face_mesh, powerpoint, profiler,
+                               preview, streamer, loop_state)
+            if not tracing:
+                latencies.append(time.perf_counter() - frame_start)
+            if result is None:
+                print("Failed to read frame from source")
+                break
+            profiler.mark("sleep")
+            clock.advance(frame_interval)
+
+            if (frame_idx + 1) % sample_frames == 0:
+                # Blocks allocated during the trace window and still alive: a leak keeps these non-zero
+                top_retained = []
+                if tracemalloc.is_tracing():
+                    snapshot = tracemalloc.take_snapshot().filter_traces(
+                        [tracemalloc.Filter(False, tracemalloc.__file__)])
+                    tracemalloc.stop()
+                    top_retained = snapshot.statistics("lineno")
+                retained_kb = sum(stat.size for stat in top_retained) / 1024
+                sample = {
+                    'sim_hours': (frame_idx + 1) / args.fps / 3600,
+                    'rss_mb': read_rss_mb(),
+                    'retained_kb': retained_kb,
+                    'p50_ms': np.percentile(latencies, 50) * 1000,
+                    'p95_ms': np.percentile(latencies, 95) * 1000,
+                    'p99_ms': np.percentile(latencies, 99) * 1000,
+                }
+                samples.append(sample)
+                if args.profile_seconds > 0 and len(samples) == 1:
+                    profiler.trigger()  # Profile the steady state after warm-up
+                latencies = []
+                rss = f"{sample['rss_mb']:.1f}MB" if sample['rss_mb'] is not None else "n/a"
+                print(f"[{sample['sim_hours']:6.2f}h] RSS {rss} | retained over {trace_frames} traced frames "
+                      f"{retained_kb:.1f}KB | p50 {sample['p50_ms']:.2f}ms p95 {sample['p95_ms']:.2f}ms "
+                      f"p99 {sample['p99_ms']:.2f}ms")
+                for stat in top_retained[:args.top]:
+                    print(f"    {stat.size / 1024:.1f}KB {stat.traceback}")
+    except KeyboardInterrupt:
+        print("Interrupted by user")
+    finally:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        set_clock(time.time)
+        source.release()
+        face_mesh.close()
+        if preview:
+            preview.close()
+        if streamer:
+            streamer.close()
+
+    print(f"Soak finished in {time.perf_counter() - wall_start:.0f}s wall time, "
+          f"slideshow actions: {powerpoint.SlideShowWindows.actions}")
+    return samples
+
+
+def evaluate(samples, args):
+    """Check memory and p99 latency trends against the budget; return True when within it."""
+    # The first sample includes warm-up allocations (caches, MediaPipe graph), skip it
+    steady = samples[1:]
+    times = [s['sim_hours'] for s in steady]
+    passed = True
+
+    print("\nSoak Test Result")
+    if len(steady) < 3:
+        print(f"FAIL: {len(steady)} samples after warm-up, a trend needs at least 3 "
+              f"(run longer than {4 * args.sample_minutes:g} simulated minutes or lower --sample-minutes)")
+        return False
+    if any(s['rss_mb'] is None for s in steady):
+        print("FAIL: RSS could not be read (install psutil)")
+        return False
+
+    memory_growth = trend(times, [s['rss_mb'] for s in steady])
+    latency_growth = trend(times, [s['p99_ms'] for s in steady])
+
+    print(f"RSS trend: {memory_growth:+.2f}MB (budget {args.max_memory_growth_mb:.2f}MB)")
+    print(f"p99 latency trend: {latency_growth:+.2f}ms (budget {args.max_p99_growth_ms:.2f}ms)")
+    if memory_growth > args.max_memory_growth_mb:
+        print("FAIL: memory grows beyond budget")
+        passed = False
+    if latency_growth > args.max_p99_growth_ms:
+        print("FAIL: p99 latency grows beyond budget")
+        passed = False
+    if passed:
+        print("PASS")
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak test the gesture pipeline over simulated hours")
+    parser.add_argument("--hours", type=float, default=4.0, help="Simulated session length")
+    parser.add_argument("--fps", type=float, default=30.0, help="Simulated camera frame rate")
+    parser.add_argument("--video", default=None, help="Loop a recorded video through FaceMesh instead of synthetic landmarks")
+    parser.add_argument("--sample-minutes", type=float, default=10.0, help="Simulated minutes between samples")
+    parser.add_argument("--top", type=int, default=5, help="tracemalloc allocators to print per sample")
+    parser.add_argument("--trace-frames", type=int, default=30,
+                        help="Frames before each sample traced by tracemalloc (excluded from latency, 0 disables)")
+    parser.add_argument("--trace-depth", type=int, default=1, help="tracemalloc traceback depth")
+    parser.add_argument("--max-memory-growth-mb", type=float, default=20.0, help="Allowed memory trend over the run")
+    parser.add_argument("--max-p99-growth-ms", type=float, default=2.0, help="Allowed p99 latency trend over the run")
+    parser.add_argument("--output", default=None, help="Write the samples to this CSV file")
+    parser.add_argument("--preview", action="store_true", help="Publish frames to the preview window process")
+    parser.add_argument("--stream-port", type=int, default=None, help="Serve the MJPEG preview stream on this port")
+    parser.add_argument("--profile-seconds", type=float, default=0.0,
+                        help="Capture a profile of this many wall-clock seconds after the first sample")
+    parser.add_argument("--profile-dir", default="profiles", help="Directory for collapsed-stack profile files")
+    args = parser.parse_args()
+
+    samples = run_soak(args)
+    if args.output and samples:
+        with open(args.output, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(samples[0].keys()))
+            writer.writeheader()
+            writer.writerows(samples)
+        print(f"Samples written to {args.output}")
+
+    analyze_performance()
+    sys.exit(0 if evaluate(samples, args) else 1)
+
+
+if __name__ == "__main__":
+    main()
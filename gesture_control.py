@@ -1,63 +1,142 @@
 import sys
 import time
-import cv2
 import os
+import argparse
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 try:
     from gesture_control.powerpoint import minimize_console, initialize_powerpoint, bring_to_foreground, close_powerpoint, check_slideshow_active
-    from gesture_control.webcam import initialize_webcam, read_frame, release_webcam
-    from gesture_control.gesture import initialize_face_mesh, process_gestures, analyze_performance, set_condition, record_ground_truth
+    powerpoint_import_error = None
+except ImportError as e:
+    # PowerPoint automation needs pywin32; --no-powerpoint runs without it
+    powerpoint_import_error = e
+
+try:
+    from gesture_control.webcam import initialize_webcam, release_webcam
+    from gesture_control.gesture import initialize_face_mesh, analyze_performance, set_condition, record_ground_truth, set_event_publisher, configure_motion_gate
+    from gesture_control.pipeline import run_frame
+    from gesture_control.events import GestureEventPublisher, DEFAULT_EVENT_HOST
+    from gesture_control.stream import PreviewStreamer, DEFAULT_STREAM_HOST
+    from gesture_control.preview import FramePreview
+    from gesture_control.profiler import FrameProfiler
     import mediapipe as mp
 except ImportError as e:
     print(f"Import Error: {e}")
     print("Make sure all required files are in the gesture_control/ directory")
     sys.exit(1)
 
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Head gesture control for PowerPoint")
+    parser.add_argument("pptx_path", nargs="?", help="Path to the PowerPoint file")
+    parser.add_argument("--no-preview", action="store_true",
+                        help="Run without the camera preview window (ground truth hotkeys are disabled)")
+    parser.add_argument("--engine", choices=["facemesh", "landmarker"], default="facemesh",
+                        help="Inference engine: synchronous FaceMesh or asynchronous Tasks FaceLandmarker")
+    parser.add_argument("--model-path", default=None,
+                        help="FaceLandmarker .task model file (landmarker engine only)")
+    parser.add_argument("--profile-seconds", type=float, default=10.0,
+                        help="Length of an on-demand profile capture (P key or signal)")
+    parser.add_argument("--profile-dir", default="profiles",
+                        help="Directory for collapsed-stack profile files")
+    parser.add_argument("--event-port", type=int, default=None,
+                        help="Publish detected gestures to local UDP subscribers on this port")
+    parser.add_argument("--no-powerpoint", action="store_true",
+                        help="Do not open PowerPoint; gestures only go to the event bus")
+    parser.add_argument("--motion-gate", action="store_true",
+                        help="Skip face mesh inference on static frames and reuse the last landmarks")
+    parser.add_argument("--motion-threshold", type=float, default=2.0,
+                        help="Grey-level change (0-255) of the most-changed 4x4 grid cell around the face that counts as motion")
+    parser.add_argument("--motion-max-age", type=float, default=0.25,
+                        help="Seconds landmarks may be reused before inference is forced")
+    parser.add_argument("--stream-port", type=int, default=None,
+                        help="Serve a live MJPEG preview and metrics over HTTP on this port")
+    parser.add_argument("--stream-fps", type=float, default=10.0,
+                        help="Maximum frame rate of the live preview stream")
+    parser.add_argument("--stream-width", type=int, default=640,
+                        help="Width the live preview stream is downscaled to")
+    return parser.parse_args()
+
 def main():
     print("Starting head gesture control application...")
+    args = parse_args()
     
-    if len(sys.argv) < 2:
-        print("Error: No PowerPoint file path provided.")
-        print("Usage: python gesture_control.py <path_to_pptx_file>")
-        sys.exit(1)
-    
-    pptx_path = sys.argv[1]
-    print(f"PowerPoint file path: {pptx_path}")
-    
-    if not os.path.exists(pptx_path):
-        print(f"Error: PowerPoint file does not exist: {pptx_path}")
-        sys.exit(1)
-    
-    try:
-        minimize_console()
-    except Exception as e:
-        print(f"Warning: Could not minimize console: {e}")
+    powerpoint, presentation = None, None
+    if args.no_powerpoint:
+        if args.event_port is None:
+            print("Warning: --no-powerpoint without --event-port, gestures will only be shown in the preview")
+    else:
+        if powerpoint_import_error:
+            print(f"Import Error: {powerpoint_import_error}")
+            print("PowerPoint control requires pywin32 on Windows (use --no-powerpoint otherwise)")
+            sys.exit(1)
+
+        if not args.pptx_path:
+            print("Error: No PowerPoint file path provided.")
+            print("Usage: python gesture_control.py <path_to_pptx_file>")
+            sys.exit(1)
+        
+        pptx_path = args.pptx_path
+        print(f"PowerPoint file path: {pptx_path}")
+        
+        if not os.path.exists(pptx_path):
+            print(f"Error: PowerPoint file does not exist: {pptx_path}")
+            sys.exit(1)
+        
+        try:
+            minimize_console()
+        except Exception as e:
+            print(f"Warning: Could not minimize console: {e}")
 
-    try:
-        powerpoint, presentation = initialize_powerpoint(pptx_path)
-        foreground_success = bring_to_foreground(powerpoint)
-        if not foreground_success:
-            print("Warning: Could not bring PowerPoint to foreground, but continuing...")
-    except Exception as e:
-        print(f"Error initializing PowerPoint: {e}")
-        sys.exit(1)
+        try:
+            powerpoint, presentation = initialize_powerpoint(pptx_path)
+            foreground_success = bring_to_foreground(powerpoint)
+            if not foreground_success:
+                print("Warning: Could not bring PowerPoint to foreground, but continuing...")
+        except Exception as e:
+            print(f"Error initializing PowerPoint: {e}")
+            sys.exit(1)
 
     try:
         cap = initialize_webcam(width=1280, height=720)
-        mp_face_mesh, face_mesh = initialize_face_mesh()
+        if args.engine == "landmarker":
+            from gesture_control.landmarker import initialize_face_landmarker, DEFAULT_MODEL_PATH
+            mp_face_mesh, face_mesh = initialize_face_landmarker(args.model_path or DEFAULT_MODEL_PATH)
+        else:
+            mp_face_mesh, face_mesh = initialize_face_mesh()
         mp_drawing = mp.solutions.drawing_utils
-        print("Webcam and MediaPipe Face Mesh initialized successfully")
+        if args.motion_gate:
+            configure_motion_gate(args.motion_threshold, args.motion_max_age)
+            print(f"Motion gating enabled (threshold {args.motion_threshold}, max reuse {args.motion_max_age}s)")
+        print(f"Webcam and MediaPipe {args.engine} engine initialized successfully")
     except Exception as e:
         print(f"Error initializing webcam/MediaPipe: {e}")
         try:
-            if 'powerpoint' in locals():
+            if powerpoint is not None:
                 close_powerpoint(powerpoint, presentation)
         except:
             pass
         sys.exit(1)
 
+    preview = None if args.no_preview else FramePreview()
+    streamer = None
+    if args.stream_port is not None:
+        try:
+            streamer = PreviewStreamer(DEFAULT_STREAM_HOST, args.stream_port,
+                                       max_fps=args.stream_fps, width=args.stream_width)
+        except OSError as e:
+            print(f"Warning: Could not start live preview stream on port {args.stream_port}: {e}")
+    event_publisher = None
+    if args.event_port is not None:
+        try:
+            event_publisher = GestureEventPublisher(DEFAULT_EVENT_HOST, args.event_port)
+            set_event_publisher(event_publisher)
+        except OSError as e:
+            print(f"Warning: Could not start gesture event bus on port {args.event_port}: {e}")
+    profiler = FrameProfiler(duration=args.profile_seconds, output_dir=args.profile_dir)
+    profile_signal = profiler.install_signal_handler()
+
     target_fps = 30
     frame_time = 1.0 / target_fps
 
@@ -66,36 +145,35 @@ def main():
     print("- Tilt head RIGHT: Next slide")
     print("- Tilt head LEFT: Previous slide") 
     print("- Triple TILT (same direction): Detected (Press ESC to exit)")
-    print("- ESC key: Exit application")
-    print("Record ground truth: Press R (Tilt Right), L (Tilt Left), T (Triple Tilt) when performing the gesture!")
+    if preview:
+        print("- ESC key: Exit application")
+        print("Record ground truth: Press R (Tilt Right), L (Tilt Left), T (Triple Tilt) when performing the gesture!")
+    else:
+        print("- Ctrl+C: Exit application (preview disabled)")
+    if preview:
+        print(f"Profile the next {args.profile_seconds:.0f} seconds of the frame loop: Press P")
+    if profile_signal == "SIGBREAK":
+        print("Profile from outside the preview window: Press Ctrl+Break in this console")
+    elif profile_signal:
+        print(f"Profile from outside the session: kill -{profile_signal[3:]} {os.getpid()}")
     print("Make sure your face is clearly visible in the camera!")
 
     conditions = ["optimal", "low_light", "backlit", "artificial", "natural"]
     condition_idx = 0
+    loop_state = {}  # Carries the streamed FPS estimate between frames
 
     try:
         while True:
             start_time = time.time()
+            set_condition(conditions[condition_idx // 200 % len(conditions)])
 
-            frame = read_frame(cap)
-            if frame is None:
+            result = run_frame(cap, face_mesh, mp_drawing, mp_face_mesh, powerpoint, profiler,
+                               preview, streamer, loop_state)
+            if result is None:
                 print("Failed to read frame from webcam")
                 break
+            head_detected, exit_detected, delay, key = result
 
-            current_condition = conditions[condition_idx // 200 % len(conditions)]
-            set_condition(current_condition)
-            
-            try:
-                frame, head_detected, exit_detected, delay = process_gestures(
-                    frame, face_mesh, mp_drawing, mp.solutions.face_mesh, powerpoint
-                )
-            except Exception as e:
-                print(f"Error processing gestures: {e}")
-                continue
-
-            cv2.imshow('Head Gesture Control for PowerPoint', frame)
-
-            key = cv2.waitKey(1) & 0xFF
             if key == 27:  # ESC
                 print("ESC key pressed. Exiting...")
                 break
@@ -108,6 +186,8 @@ def main():
             elif key == ord('t'):  # Record Triple Tilt
                 record_ground_truth("triple_tilt")
                 print("Recorded ground truth: Triple Tilt")
+            elif key == ord('p'):  # Capture a profile
+                profiler.trigger()
                 
             if exit_detected:
                 print("Triple tilt gesture detected. Closing PowerPoint presentation.")
@@ -116,6 +196,7 @@ def main():
             condition_idx += 1
             elapsed_time = time.time() - start_time
             sleep_time = max(0, frame_time - elapsed_time - delay)
+            profiler.mark("sleep")
             if sleep_time > 0:
                 time.sleep(sleep_time)
 
@@ -130,9 +211,14 @@ def main():
             analyze_performance()  # Print performance analysis
             if cap:
                 release_webcam(cap)
-            if 'cv2' in globals():
-                cv2.destroyAllWindows()
-            if 'powerpoint' in locals() and 'presentation' in locals():
+            if preview:
+                preview.close()
+            if streamer:
+                streamer.close()
+            if event_publisher:
+                set_event_publisher(None)
+                event_publisher.close()
+            if powerpoint is not None:
                 close_powerpoint(powerpoint, presentation)
             if 'face_mesh' in locals():
                 face_mesh.close()
@@ -0,0 +1,141 @@
+import json
+import queue
+import socket
+import threading
+import time
+
+DEFAULT_EVENT_HOST = "127.0.0.1"
+DEFAULT_EVENT_PORT = 5555
+SUBSCRIBE = b"subscribe"
+UNSUBSCRIBE = b"unsubscribe"
+SUBSCRIPTION_TIMEOUT = 10.0  # Subscribers that stay silent this long are dropped
+HEARTBEAT_INTERVAL = 3.0  # How often subscribers renew their subscription
+
+
+class GestureEventPublisher:
+    """Fan gesture events out to local subscribers over UDP.
+
+    Subscribers register by sending b"subscribe" to the publisher's port and
+    renew it every few seconds. Each event is one datagram holding a line of
+    JSON: {"seq", "gesture", "roll", "confidence", "timestamp"}, where timestamp
+    is the capture time of the frame the gesture was detected on.
+
+    publish() only puts the event on a queue; encoding and sending happen on a
+    background thread, so the frame loop never waits on subscribers.
+    """
+
+    def __init__(self, host=DEFAULT_EVENT_HOST, port=DEFAULT_EVENT_PORT, max_pending=256):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.sock.setblocking(False)
+        self.address = self.sock.getsockname()
+        self.subscribers = {}  # address -> last time it (re)subscribed
+        self.events = queue.Queue(maxsize=max_pending)
+        self.seq = 0
+        self.dropped = 0
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="gesture-events", daemon=True)
+        self.thread.start()
+        print(f"Gesture event bus publishing on udp://{self.address[0]}:{self.address[1]}")
+
+    def publish(self, gesture, roll, confidence, timestamp):
+        """Queue a gesture event for delivery without blocking."""
+        self.seq += 1
+        try:
+            self.events.put_nowait((self.seq, gesture, roll, confidence, timestamp))
+        except queue.Full:
+            self.dropped += 1
+
+    def _poll_subscriptions(self):
+        """Handle pending subscribe/unsubscribe datagrams."""
+        while True:
+            try:
+                data, address = self.sock.recvfrom(64)
+            except OSError:
+                # Nothing pending, or (on Windows) a reset reported for a vanished subscriber
+                return
+            if data == SUBSCRIBE:
+                self.subscribers[address] = time.monotonic()
+            elif data == UNSUBSCRIBE:
+                self.subscribers.pop(address, None)
+
+    def _run(self):
+        while self.running:
+            try:
+                event = self.events.get(timeout=0.05)
+            except queue.Empty:
+                event = None
+            self._poll_subscriptions()
+
+            now = time.monotonic()
+            for address in [a for a, seen in self.subscribers.items() if now - seen > SUBSCRIPTION_TIMEOUT]:
+                del self.subscribers[address]
+
+            if event is None:
+                continue
+            seq, gesture, roll, confidence, timestamp = event
+            payload = (json.dumps({
+                'seq': seq,
+                'gesture': gesture,
+                'roll': round(roll, 2),
+                'confidence': round(confidence, 3),
+                'timestamp': timestamp,
+            }, separators=(',', ':')) + "\n").encode()
+            for address in list(self.subscribers):
+                try:
+                    self.sock.sendto(payload, address)
+                except OSError:
+                    pass  # A full or vanished subscriber must not hold up the rest
+
+    def close(self):
+        """Stop the publisher thread and close the socket."""
+        self.running = False
+        self.thread.join(timeout=1.0)
+        self.sock.close()
+
+
+class GestureEventSubscriber:
+    """Receive gesture events from a GestureEventPublisher."""
+
+    def __init__(self, host=DEFAULT_EVENT_HOST, port=DEFAULT_EVENT_PORT):
+        self.publisher = (host, port)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, 0))
+        self.last_heartbeat = 0.0
+        self._heartbeat()
+
+    def _heartbeat(self):
+        self.sock.sendto(SUBSCRIBE, self.publisher)
+        self.last_heartbeat = time.monotonic()
+
+    def receive(self, timeout=None):
+        """Return the next event as a dict, or None if none arrived within timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = HEARTBEAT_INTERVAL - (time.monotonic() - self.last_heartbeat)
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+            self.sock.settimeout(max(wait, 0.0))
+            try:
+                data, _ = self.sock.recvfrom(1024)
+                return json.loads(data)
+            except (socket.timeout, BlockingIOError, ConnectionResetError):
+                pass
+            if time.monotonic() - self.last_heartbeat >= HEARTBEAT_INTERVAL:
+                self._heartbeat()
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+
+    def __iter__(self):
+        while True:
+            event = self.receive()
+            if event is not None:
+                yield event
+
+    def close(self):
+        """Unsubscribe and close the socket."""
+        try:
+            self.sock.sendto(UNSUBSCRIBE, self.publisher)
+        except OSError:
+            pass
+        self.sock.close()
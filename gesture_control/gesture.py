@@ -3,44 +3,124 @@ import cv2
 import math
 import time
 import numpy as np
-from collections import defaultdict
+from collections import defaultdict, deque
 
 # Global variables for gesture timing and performance tracking
 last_tilt_time = 0
 tilt_cooldown = 0.8
+tilt_threshold = 15
 triple_tilt_sequence = []
 last_triple_tilt_time = 0
 triple_tilt_timeout = 3.0
 triple_tilt_threshold = 20
 performance_data = defaultdict(list)  # Store performance metrics
+gesture_counts = defaultdict(int)  # Detected gestures, including ones PowerPoint did not act on
 condition = "optimal"  # Current lighting condition
-ground_truth = []  # Store expected gestures
+ground_truth = deque()  # Expected gestures still inside the matching window
+ground_truth_window = 1.0  # Seconds a ground truth entry can match a detection
+event_publisher = None  # Optional GestureEventPublisher for non-PowerPoint consumers
+clock = time.time  # Source of gesture and ground truth timestamps, replaceable with set_clock()
 
-def initialize_face_mesh():
+# Motion gating: reuse the last landmarks while the face region is static
+motion_gate_threshold = None  # Grey-level change (0-255) of the most-changed cell that counts as motion; None disables gating
+motion_gate_max_age = 0.25  # Seconds landmarks may be reused before inference is forced
+motion_gate_size = (32, 32)  # Thumbnail size the compared region is shrunk to
+motion_gate_cells = (4, 4)  # Grid the thumbnail difference is averaged over before taking the maximum
+motion_gate_margin = 0.25  # Fraction of the face size added around the face on each side
+last_inferred_thumbnail = None
+last_inferred_roi = None  # (x0, y0, x1, y1) the thumbnail was taken from
+last_inferred_time = 0
+last_results = None
+motion_gate_stats = {'inferred': 0, 'reused': 0}
+
+def initialize_face_mesh(refine_landmarks=True):
     """Initialize MediaPipe Face Mesh for head tracking."""
     mp_face_mesh = mp.solutions.face_mesh
     face_mesh = mp_face_mesh.FaceMesh(
         max_num_faces=1,
-        refine_landmarks=True,
+        refine_landmarks=refine_landmarks,
         min_detection_confidence=0.5,
         min_tracking_confidence=0.5
     )
     return mp_face_mesh, face_mesh
 
+def configure_motion_gate(threshold=2.0, max_age=0.25):
+    """Enable motion gating with the given threshold, or disable it with threshold=None."""
+    global motion_gate_threshold, motion_gate_max_age, last_inferred_thumbnail, last_inferred_roi, last_results
+    motion_gate_threshold = threshold
+    motion_gate_max_age = max_age
+    last_inferred_thumbnail = None
+    last_inferred_roi = None
+    last_results = None
+
+def motion_gate_roi(results, frame_shape):
+    """Pixel box around the detected face plus motion_gate_margin, or the whole frame without a face."""
+    h, w = frame_shape[:2]
+    if not results.multi_face_landmarks:
+        return 0, 0, w, h
+    landmarks = results.multi_face_landmarks[0].landmark
+    xs = [lm.x for lm in landmarks]
+    ys = [lm.y for lm in landmarks]
+    margin_x = (max(xs) - min(xs)) * motion_gate_margin
+    margin_y = (max(ys) - min(ys)) * motion_gate_margin
+    x0 = min(max(int((min(xs) - margin_x) * w), 0), w - 1)
+    y0 = min(max(int((min(ys) - margin_y) * h), 0), h - 1)
+    x1 = max(min(int((max(xs) + margin_x) * w), w), x0 + 1)
+    y1 = max(min(int((max(ys) + margin_y) * h), h), y0 + 1)
+    return x0, y0, x1, y1
+
+def gate_thumbnail(frame, roi):
+    """Small greyscale thumbnail of the roi, compared between frames by the motion gate."""
+    x0, y0, x1, y1 = roi
+    small = cv2.resize(frame[y0:y1, x0:x1], motion_gate_size, interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+def infer_landmarks(frame, face_mesh, capture_time=None):
+    """Run face mesh on the frame, or reuse the last result while the face region is static.
+
+    Only the region around the last detected face is compared, and motion is
+    the largest change of any grid cell in it, so a head tilt is not averaged
+    away by a static background or the unchanged middle of the face.
+    Returns (results, reused), reused being True when the last result was reused.
+    """
+    global last_inferred_thumbnail, last_inferred_roi, last_inferred_time, last_results
+    now = capture_time or clock()
+    if (motion_gate_threshold is not None and last_results is not None
+            and now - last_inferred_time < motion_gate_max_age):
+        thumbnail = gate_thumbnail(frame, last_inferred_roi)
+        # Compare against the last inferred frame, so slow drift still triggers inference
+        diff = cv2.absdiff(thumbnail, last_inferred_thumbnail)
+        if cv2.resize(diff, motion_gate_cells, interpolation=cv2.INTER_AREA).max() < motion_gate_threshold:
+            motion_gate_stats['reused'] += 1
+            return last_results, True
+
+    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    if getattr(face_mesh, 'accepts_timestamp', False):
+        results = face_mesh.process(rgb_frame, timestamp=capture_time)
+    else:
+        results = face_mesh.process(rgb_frame)
+    if motion_gate_threshold is not None:
+        last_results = results
+        last_inferred_time = now
+        last_inferred_roi = motion_gate_roi(results, frame.shape)
+        last_inferred_thumbnail = gate_thumbnail(frame, last_inferred_roi)
+    motion_gate_stats['inferred'] += 1
+    return results, False
+
 def safe_slideshow_control(powerpoint, action):
     """Safely control slideshow with error handling and measure latency."""
     try:
         if powerpoint.SlideShowWindows.Count == 0:
             return False, 0.0
         slideshow = powerpoint.SlideShowWindows(1)
-        start_time = time.time()
+        start_time = time.perf_counter()
         if action == "next":
             slideshow.View.Next()
         elif action == "previous":
             slideshow.View.Previous()
         elif action == "exit":
             slideshow.View.Exit()
-        latency = time.time() - start_time
+        latency = time.perf_counter() - start_time
         return True, max(latency, 0.001)  # Minimum latency to avoid zero
     except Exception:
         return False, 0.0
@@ -77,6 +157,8 @@ def detect_triple_tilt(roll_angle, current_time):
                 'time': current_time
             })
             last_triple_tilt_time = current_time
+            if len(triple_tilt_sequence) > 3:
+                del triple_tilt_sequence[:-3]  # Only the last three tilts can form a gesture
             if len(triple_tilt_sequence) >= 3:
                 recent_tilts = triple_tilt_sequence[-3:]
                 directions = [tilt['direction'] for tilt in recent_tilts]
@@ -96,7 +178,6 @@ def detect_head_gestures(head_pose, current_time):
     if detect_triple_tilt(roll, current_time):
         return "triple_tilt"
     
-    tilt_threshold = 15
     if current_time - last_tilt_time > tilt_cooldown:
         if roll > tilt_threshold:
             gesture_detected = "tilt_right"
@@ -107,28 +188,65 @@ def detect_head_gestures(head_pose, current_time):
     
     return gesture_detected
 
+def gesture_confidence(gesture, roll_angle):
+    """Confidence of a detected gesture: 0.5 at its roll threshold, 1.0 at twice the threshold."""
+    threshold = triple_tilt_threshold if gesture == "triple_tilt" else tilt_threshold
+    return min(1.0, abs(roll_angle) / (2 * threshold))
+
+def set_event_publisher(publisher):
+    """Set the publisher that receives every detected gesture, or None to disable it."""
+    global event_publisher
+    event_publisher = publisher
+
+def set_clock(new_clock):
+    """Set the function returning the current time in seconds, e.g. a simulated clock in benchmarks."""
+    global clock
+    clock = new_clock
+
 def set_condition(new_condition):
     """Set the current lighting condition for performance tracking."""
     global condition
     condition = new_condition
 
+def reset_gesture_state():
+    """Clear gesture timing, ground truth and performance data for a fresh session."""
+    global last_tilt_time, triple_tilt_sequence, last_triple_tilt_time, condition
+    global last_inferred_thumbnail, last_inferred_roi, last_results
+    last_tilt_time = 0
+    triple_tilt_sequence = []
+    last_triple_tilt_time = 0
+    condition = "optimal"
+    performance_data.clear()
+    gesture_counts.clear()
+    ground_truth.clear()
+    last_inferred_thumbnail = None
+    last_inferred_roi = None
+    last_results = None
+    motion_gate_stats['inferred'] = 0
+    motion_gate_stats['reused'] = 0
+
 def record_ground_truth(gesture):
     """Record an expected gesture as ground truth."""
     global ground_truth
     ground_truth.append({
         'gesture': gesture,
-        'timestamp': time.time(),
+        'timestamp': clock(),
         'condition': condition
     })
 
-def process_gestures(frame, face_mesh, mp_drawing, mp_face_mesh, powerpoint):
-    """Process head gestures, control PowerPoint, and collect performance metrics."""
+def process_gestures(frame, face_mesh, mp_drawing, mp_face_mesh, powerpoint, capture_time=None):
+    """Process head gestures, control PowerPoint, and collect performance metrics.
+
+    capture_time is the clock() time at which the frame was read; gestures and
+    events are timed by it rather than by when inference finished.
+    """
     global performance_data, condition, ground_truth
-    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    results = face_mesh.process(rgb_frame)
+    results, reused = infer_landmarks(frame, face_mesh, capture_time)
     head_detected = False
     gesture_detected = None
-    current_time = time.time()
+    # Asynchronous engines report when their source frame was captured; a reused
+    # result still carries the older frame's timestamp, so use this frame's instead
+    current_time = (None if reused else getattr(results, 'timestamp', None)) or capture_time or clock()
     start_time = time.time()
 
     if results.multi_face_landmarks:
@@ -141,11 +259,18 @@ def process_gestures(frame, face_mesh, mp_drawing, mp_face_mesh, powerpoint):
             head_pose = calculate_head_pose(face_landmarks.landmark, frame.shape[:2])
             head_detected = True
             gesture_detected = detect_head_gestures(head_pose, current_time)
+            if gesture_detected:
+                gesture_counts[gesture_detected] += 1
+            if gesture_detected and event_publisher is not None:
+                event_publisher.publish(gesture_detected, head_pose['roll'],
+                                        gesture_confidence(gesture_detected, head_pose['roll']), current_time)
             
-            # Find the closest ground truth gesture within a time window (e.g., 1 second)
+            # Drop ground truth that can no longer match, then find the oldest match in the window
+            while ground_truth and ground_truth[0]['timestamp'] <= current_time - ground_truth_window:
+                ground_truth.popleft()
             expected_gesture = None
             for gt in ground_truth:
-                if abs(gt['timestamp'] - current_time) < 1.0 and gt['condition'] == condition:
+                if abs(gt['timestamp'] - current_time) < ground_truth_window and gt['condition'] == condition:
                     expected_gesture = gt['gesture']
                     break
             
@@ -246,4 +371,9 @@ def analyze_performance():
             false_positives += sum(1 for d in gesture_data if not d['correct'])
             total += len(gesture_data)
         fpr = (false_positives / total * 100) if total > 0 else 0.0
-        print(f"{gesture}: <{fpr:.1f}%")
\ No newline at end of file
+        print(f"{gesture}: <{fpr:.1f}%")
+
+    if motion_gate_threshold is not None:
+        total_frames = motion_gate_stats['inferred'] + motion_gate_stats['reused']
+        skipped = motion_gate_stats['reused'] / total_frames * 100 if total_frames > 0 else 0.0
+        print(f"\nMotion Gate: skipped inference on {motion_gate_stats['reused']} of {total_frames} frames ({skipped:.1f}%)")
\ No newline at end of file
@@ -0,0 +1,105 @@
+import os
+import threading
+import time
+
+import mediapipe as mp
+from mediapipe.framework.formats import landmark_pb2
+
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "face_landmarker.task")
+MODEL_URL = "https://storage.googleapis.com/mediapipe-models/face_landmarker/face_landmarker/float16/1/face_landmarker.task"
+
+
+class LandmarkerResults:
+    """FaceMesh-compatible result tagged with the timestamp of the frame it came from."""
+
+    def __init__(self, multi_face_landmarks=None, timestamp=None, latency=0.0):
+        self.multi_face_landmarks = multi_face_landmarks
+        self.timestamp = timestamp  # time.time() of the source frame
+        self.latency = latency  # Seconds from detect_async to the result callback
+
+
+class AsyncFaceLandmarker:
+    """MediaPipe Tasks FaceLandmarker running in LIVE_STREAM mode.
+
+    process() hands the frame to detect_async and returns straight away with the
+    newest result delivered by the callback, so capture and inference overlap.
+    Results keep the timestamp of the frame they were computed on, which keeps
+    gesture timing tied to when the head actually moved.
+    """
+
+    accepts_timestamp = True  # process() takes the capture time of the frame
+
+    def __init__(self, model_path=DEFAULT_MODEL_PATH, max_num_faces=1,
+                 min_detection_confidence=0.5, min_tracking_confidence=0.5):
+        self.lock = threading.Lock()
+        self.latest = LandmarkerResults()
+        self.pending = {}  # timestamp_ms -> perf_counter() at submission
+        self.last_timestamp_ms = -1
+        self.frames_submitted = 0
+        self.results_received = 0
+
+        options = mp.tasks.vision.FaceLandmarkerOptions(
+            base_options=mp.tasks.BaseOptions(model_asset_path=model_path),
+            running_mode=mp.tasks.vision.RunningMode.LIVE_STREAM,
+            num_faces=max_num_faces,
+            min_face_detection_confidence=min_detection_confidence,
+            min_face_presence_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+            result_callback=self._on_result
+        )
+        self.landmarker = mp.tasks.vision.FaceLandmarker.create_from_options(options)
+
+    def _on_result(self, result, output_image, timestamp_ms):
+        """Convert the Tasks result to FaceMesh landmark lists and publish it."""
+        received = time.perf_counter()
+        faces = []
+        for face in result.face_landmarks:
+            landmark_list = landmark_pb2.NormalizedLandmarkList()
+            landmark_list.landmark.extend(
+                landmark_pb2.NormalizedLandmark(x=lm.x, y=lm.y, z=lm.z) for lm in face
+            )
+            faces.append(landmark_list)
+
+        with self.lock:
+            submitted = self.pending.pop(timestamp_ms, received)
+            # Frames dropped by the graph never get a callback, forget them too
+            for stale in [ts for ts in self.pending if ts < timestamp_ms]:
+                del self.pending[stale]
+            self.latest = LandmarkerResults(
+                multi_face_landmarks=faces or None,
+                timestamp=timestamp_ms / 1000.0,
+                latency=received - submitted
+            )
+            self.results_received += 1
+
+    def process(self, rgb_frame, timestamp=None):
+        """Submit a frame captured at timestamp (time.time()) and return the most recent finished result."""
+        if timestamp is None:
+            timestamp = time.time()
+        # detect_async requires strictly increasing timestamps
+        timestamp_ms = max(int(timestamp * 1000), self.last_timestamp_ms + 1)
+        self.last_timestamp_ms = timestamp_ms
+
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
+        with self.lock:
+            self.pending[timestamp_ms] = time.perf_counter()
+        self.landmarker.detect_async(mp_image, timestamp_ms)
+        self.frames_submitted += 1
+
+        with self.lock:
+            return self.latest
+
+    def close(self):
+        """Release the landmarker."""
+        self.landmarker.close()
+
+
+def initialize_face_landmarker(model_path=DEFAULT_MODEL_PATH):
+    """Initialize the asynchronous MediaPipe Tasks FaceLandmarker for head tracking."""
+    if not os.path.exists(model_path):
+        print(f"Error: FaceLandmarker model not found: {model_path}")
+        print(f"Download it from {MODEL_URL}")
+        raise RuntimeError("FaceLandmarker model file missing.")
+    face_landmarker = AsyncFaceLandmarker(model_path)
+    # Drawing still uses the FaceMesh connection sets
+    return mp.solutions.face_mesh, face_landmarker
@@ -0,0 +1,67 @@
+import time
+
+import numpy as np
+
+from gesture_control import gesture
+from gesture_control.gesture import process_gestures, gesture_counts
+from gesture_control.webcam import read_frame
+
+
+def run_frame(cap, face_mesh, mp_drawing, mp_face_mesh, powerpoint, profiler,
+              preview=None, streamer=None, loop_state=None):
+    """Run one iteration of the frame loop: capture, gestures, preview and stream.
+
+    Shared by gesture_control.py and the benchmarks, so a benchmark exercises the
+    same capture, ring-buffer publish and profiler stages as a live session.
+    loop_state is a dict the caller keeps between frames for the streamed metrics.
+    Returns (head_detected, exit_detected, delay, key), or None when no frame
+    could be read.
+    """
+    if loop_state is None:
+        loop_state = {}
+    frame_started = time.perf_counter()
+
+    profiler.mark("capture")
+    # Preprocess straight into the preview ring slot, so the annotated frame is published without a copy
+    frame = read_frame(cap, out=preview.frame_buffer() if preview else None)
+    if frame is None:
+        return None
+    capture_time = gesture.clock()  # Gesture events are stamped with when the frame was read
+    captured_at = time.perf_counter()
+
+    profiler.mark("gestures")
+    try:
+        frame, head_detected, exit_detected, delay = process_gestures(
+            frame, face_mesh, mp_drawing, mp_face_mesh, powerpoint, capture_time
+        )
+    except Exception as e:
+        print(f"Error processing gestures: {e}")
+        return False, False, 0.0, None
+    processed_at = time.perf_counter()
+
+    profiler.mark("preview")
+    key = None
+    if preview:
+        preview.publish(frame)
+        key = preview.poll_key()
+
+    loop_state['frames'] = loop_state.get('frames', 0) + 1
+    if streamer:
+        # Encoding happens on the streamer's thread. A ring slot is rewritten a few frames later,
+        # so frames living in the ring are copied (only when the stream's rate limit takes them)
+        streamer.offer(frame, copy=preview is not None and np.may_share_memory(frame, preview.frames))
+        now = time.perf_counter()
+        last_frame_at = loop_state.get('last_frame_at', frame_started)
+        loop_state['fps'] = 0.9 * loop_state.get('fps', 0.0) + 0.1 / max(now - last_frame_at, 1e-6)
+        loop_state['last_frame_at'] = now
+        streamer.update_metrics(
+            fps=loop_state['fps'],
+            capture_ms=(captured_at - frame_started) * 1000,
+            gestures_ms=(processed_at - captured_at) * 1000,
+            preview_ms=(now - processed_at) * 1000,
+            head_detected=head_detected,
+            gestures=dict(gesture_counts),
+            frames=loop_state['frames']
+        )
+
+    return head_detected, exit_detected, delay, key
@@ -0,0 +1,159 @@
+import os
+import queue
+import signal
+import subprocess
+import sys
+import threading
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+PREVIEW_WINDOW_NAME = 'Head Gesture Control for PowerPoint'
+RING_SLOTS = 4  # Frames kept in the ring so the writer never touches the frame being shown
+HEADER_FIELDS = 2  # [frames written, stop flag]
+
+
+def _preview_loop(shm_name, frame_shape, slots, window_name):
+    """Show the newest frame from the shared ring buffer and print key presses to stdout."""
+    if hasattr(signal, "SIGBREAK"):
+        # Ctrl+Break reaches every process on the console; it is meant for the main process's profiler
+        signal.signal(signal.SIGBREAK, signal.SIG_IGN)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        # The main process owns the segment; do not let this process's tracker unlink it
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+
+    header = np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+    frames = np.ndarray((slots,) + tuple(frame_shape), dtype=np.uint8,
+                        buffer=shm.buf, offset=header.nbytes)
+    last_seq = 0
+    try:
+        while not header[1]:
+            seq = int(header[0])
+            if seq != last_seq:
+                # imshow reads straight from the shared slot, no intermediate copy
+                cv2.imshow(window_name, frames[(seq - 1) % slots])
+                last_seq = seq
+            key = cv2.waitKey(5) & 0xFF
+            if key != 255:
+                print(key, flush=True)
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+    finally:
+        del header, frames  # Views must be released before the segment is closed
+        cv2.destroyAllWindows()
+        shm.close()
+
+
+class FramePreview:
+    """Out-of-process preview window fed through a shared-memory ring buffer.
+
+    The frame loop asks for frame_buffer(), has the frame preprocessed and
+    annotated directly in that ring slot, and publish() then only bumps a
+    counter. The preview process does all the window work, so a slow or
+    minimized window cannot stall gesture detection. It runs this module as a
+    script, so it only loads OpenCV and NumPy. Key presses come back one per
+    line on its stdout and are read with poll_key().
+    """
+
+    def __init__(self, window_name=PREVIEW_WINDOW_NAME, slots=RING_SLOTS):
+        self.window_name = window_name
+        self.slots = slots
+        self.shm = None
+        self.header = None
+        self.frames = None
+        self.process = None
+        self.keys = queue.Queue()
+        self.copied_frames = 0  # Frames that could not be written in place
+
+    def _start(self, frame_shape):
+        """Allocate the ring buffer for frames of the given shape and start the window process."""
+        header_bytes = HEADER_FIELDS * np.dtype(np.int64).itemsize
+        frame_bytes = int(np.prod(frame_shape))
+        self.shm = shared_memory.SharedMemory(create=True, size=header_bytes + self.slots * frame_bytes)
+        self.header = np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=self.shm.buf)
+        self.header[:] = 0
+        self.frames = np.ndarray((self.slots,) + tuple(frame_shape), dtype=np.uint8,
+                                 buffer=self.shm.buf, offset=header_bytes)
+
+        height, width, channels = frame_shape
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), self.shm.name,
+             str(height), str(width), str(channels), str(self.slots), self.window_name],
+            stdout=subprocess.PIPE, text=True
+        )
+        threading.Thread(target=self._read_keys, name="preview-keys", daemon=True).start()
+        print(f"Preview window started in process {self.process.pid}")
+
+    def _read_keys(self):
+        for line in self.process.stdout:
+            try:
+                self.keys.put(int(line))
+            except ValueError:
+                pass
+
+    def frame_buffer(self):
+        """Return the ring slot the next frame should be written into, or None before the first publish."""
+        if self.shm is None:
+            return None
+        return self.frames[int(self.header[0]) % self.slots]
+
+    def publish(self, frame):
+        """Make a frame visible to the preview process.
+
+        Frames written into frame_buffer() are published without copying; any
+        other frame is copied into the next slot.
+        """
+        if self.shm is None:
+            self._start(frame.shape)
+
+        seq = int(self.header[0])
+        slot = self.frames[seq % self.slots]
+        if not np.may_share_memory(frame, slot):
+            if frame.shape != slot.shape:
+                cv2.resize(frame, (slot.shape[1], slot.shape[0]), dst=slot)
+            else:
+                np.copyto(slot, frame)
+            self.copied_frames += 1
+        self.header[0] = seq + 1
+
+    def poll_key(self):
+        """Return the next key pressed in the preview window, or None if there is none."""
+        try:
+            return self.keys.get_nowait()
+        except queue.Empty:
+            return None
+
+    def close(self):
+        """Stop the preview process and release the shared memory."""
+        if self.shm is None:
+            return
+        print("Closing preview window...")
+        self.header[1] = 1
+        if self.process is not None:
+            try:
+                self.process.wait(timeout=2.0)
+            except subprocess.TimeoutExpired:
+                self.process.terminate()
+                self.process.wait(timeout=1.0)
+        self.header = None
+        self.frames = None
+        try:
+            self.shm.close()
+        except BufferError:
+            pass  # A frame from the ring is still referenced; the mapping goes away with the process
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+        self.shm = None
+        print(f"Preview window closed ({self.copied_frames} frames needed a copy)")
+
+
+if __name__ == "__main__":
+    _, shm_name, height, width, channels, slots, window_name = sys.argv
+    _preview_loop(shm_name, (int(height), int(width), int(channels)), int(slots), window_name)
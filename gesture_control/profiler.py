@@ -0,0 +1,109 @@
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+
+import numpy as np
+
+
+class FrameProfiler:
+    """On-demand sampling profiler for the frame loop.
+
+    While idle the loop only pays for mark(), which stores the current stage name.
+    trigger() (hotkey or signal) starts a background thread that samples the
+    frame loop's stack for a few seconds, then writes a collapsed-stack file for
+    flamegraph.pl / speedscope plus a per-stage timing summary. Each sampled
+    stack is rooted at the stage the loop was in, e.g. "stage:capture;...".
+    """
+
+    def __init__(self, duration=10.0, interval=0.005, output_dir="profiles"):
+        self.duration = duration
+        self.interval = interval
+        self.output_dir = output_dir
+        self.thread_id = threading.get_ident()  # The frame loop thread to sample
+        self.active = False
+        self.stage = "idle"
+        self.stage_started = 0.0
+        self.stage_times = defaultdict(list)
+        self.stacks = Counter()
+        self.sampler = None
+
+    def mark(self, stage):
+        """Record that the frame loop has entered a new stage."""
+        if self.active:
+            now = time.perf_counter()
+            self.stage_times[self.stage].append(now - self.stage_started)
+            self.stage_started = now
+        self.stage = stage
+
+    def trigger(self):
+        """Start capturing the next `duration` seconds, unless a capture is running."""
+        if self.active:
+            return
+        self.stage_times = defaultdict(list)
+        self.stacks = Counter()
+        self.stage_started = time.perf_counter()
+        self.active = True
+        self.sampler = threading.Thread(target=self._sample, name="frame-profiler", daemon=True)
+        self.sampler.start()
+        print(f"Profiling frame loop for {self.duration:.0f} seconds...")
+
+    def install_signal_handler(self):
+        """Trigger a capture on SIGUSR1 (POSIX) or Ctrl+Break (Windows)."""
+        signum = getattr(signal, "SIGUSR1", None) or getattr(signal, "SIGBREAK", None)
+        if signum is None:
+            return None
+        signal.signal(signum, lambda *_: self.trigger())
+        return signal.Signals(signum).name
+
+    def _sample(self):
+        """Collect stacks of the frame loop thread until the capture window ends."""
+        # Keep this capture's tables; a trigger() after active clears replaces the attributes
+        stacks = self.stacks
+        stage_times = self.stage_times
+        end_time = time.perf_counter() + self.duration
+        while time.perf_counter() < end_time:
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                names = []
+                while frame is not None:
+                    code = frame.f_code
+                    names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                names.append(f"stage:{self.stage}")
+                stacks[";".join(reversed(names))] += 1
+            time.sleep(self.interval)
+        self.active = False
+        self._write(stacks, stage_times)
+
+    def _write(self, stacks, stage_times):
+        """Write the collapsed stacks and stage timings, and print a short summary."""
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            base = os.path.join(self.output_dir, time.strftime("profile_%Y%m%d_%H%M%S"))
+            with open(base + ".folded", "w") as f:
+                for stack, count in stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+
+            stages = {}
+            for stage, durations in list(stage_times.items()):
+                if durations:
+                    stages[stage] = {
+                        'count': len(durations),
+                        'mean_ms': float(np.mean(durations)) * 1000,
+                        'p95_ms': float(np.percentile(durations, 95)) * 1000,
+                        'max_ms': float(np.max(durations)) * 1000,
+                    }
+            with open(base + ".stages.json", "w") as f:
+                json.dump({'duration_s': self.duration, 'interval_s': self.interval,
+                           'samples': sum(stacks.values()), 'stages': stages}, f, indent=2)
+
+            print(f"Profile written to {base}.folded ({sum(stacks.values())} samples)")
+            for stage, stats in stages.items():
+                print(f"  {stage:10}: mean {stats['mean_ms']:.2f}ms, p95 {stats['p95_ms']:.2f}ms, "
+                      f"max {stats['max_ms']:.2f}ms over {stats['count']} frames")
+        except Exception as e:
+            print(f"Error writing profile: {e}")
@@ -0,0 +1,170 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import cv2
+
+DEFAULT_STREAM_HOST = "127.0.0.1"
+DEFAULT_STREAM_PORT = 8765
+BOUNDARY = "frame"
+
+
+class PreviewStreamer:
+    """Serve a downscaled MJPEG preview and live metrics over local HTTP.
+
+    offer() is the only call made from the frame loop: it keeps a reference to
+    at most max_fps frames per second and wakes the encoder thread, which
+    downscales and JPEG-encodes them off the inference thread. JPEG quality
+    adapts so each frame stays within the encode time and size budget.
+
+    Endpoints: /stream.mjpg (multipart MJPEG), /snapshot.jpg and /metrics.json.
+    """
+
+    def __init__(self, host=DEFAULT_STREAM_HOST, port=DEFAULT_STREAM_PORT, max_fps=10, width=640,
+                 quality=70, min_quality=30, max_quality=85, max_frame_bytes=60000, encode_budget=0.015):
+        self.interval = 1.0 / max_fps
+        self.width = width
+        self.quality = quality
+        self.min_quality = min_quality
+        self.max_quality = max_quality
+        self.max_frame_bytes = max_frame_bytes
+        self.encode_budget = encode_budget  # Seconds one resize + encode may take
+
+        self.next_offer = 0.0
+        self.pending = None
+        self.frame_ready = threading.Condition()
+        self.jpeg = None
+        self.jpeg_seq = 0
+        self.jpeg_ready = threading.Condition()
+        self.encoded_frames = 0
+        self.metrics = {}
+        self.running = True
+
+        self.encoder = threading.Thread(target=self._encode_loop, name="preview-encoder", daemon=True)
+        self.encoder.start()
+        self.server = ThreadingHTTPServer((host, port), self._make_handler())
+        self.server.daemon_threads = True
+        self.address = self.server.server_address
+        self.server_thread = threading.Thread(target=self.server.serve_forever, name="preview-http", daemon=True)
+        self.server_thread.start()
+        print(f"Live preview stream at http://{self.address[0]}:{self.address[1]}/stream.mjpg")
+
+    def offer(self, frame, copy=False):
+        """Hand a frame to the encoder if the rate limit allows.
+
+        The frame must not be modified afterwards; pass copy=True for frames in a
+        buffer that gets reused, such as a preview ring slot, and only frames
+        that pass the rate limit are copied.
+        """
+        now = time.perf_counter()
+        if now < self.next_offer:
+            return
+        self.next_offer = now + self.interval
+        if copy:
+            frame = frame.copy()
+        with self.frame_ready:
+            self.pending = frame
+            self.frame_ready.notify()
+
+    def update_metrics(self, **metrics):
+        """Replace the metrics served at /metrics.json."""
+        self.metrics = metrics
+
+    def _encode_loop(self):
+        while self.running:
+            with self.frame_ready:
+                while self.pending is None and self.running:
+                    self.frame_ready.wait(timeout=0.5)
+                frame, self.pending = self.pending, None
+            if frame is None:
+                continue
+
+            start = time.perf_counter()
+            h, w = frame.shape[:2]
+            if w > self.width:
+                frame = cv2.resize(frame, (self.width, int(h * self.width / w)), interpolation=cv2.INTER_AREA)
+            ok, encoded = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+            elapsed = time.perf_counter() - start
+            if not ok:
+                continue
+
+            # Back off quickly when over budget, recover slowly when well under it
+            size = len(encoded)
+            if elapsed > self.encode_budget or size > self.max_frame_bytes:
+                self.quality = max(self.min_quality, self.quality - 5)
+            elif elapsed < self.encode_budget / 2 and size < self.max_frame_bytes * 0.7:
+                self.quality = min(self.max_quality, self.quality + 1)
+
+            with self.jpeg_ready:
+                self.jpeg = encoded.tobytes()
+                self.jpeg_seq += 1
+                self.jpeg_ready.notify_all()
+            self.encoded_frames += 1
+
+    def _wait_for_jpeg(self, last_seq, timeout=1.0):
+        """Block until a JPEG newer than last_seq exists; return (seq, jpeg)."""
+        with self.jpeg_ready:
+            self.jpeg_ready.wait_for(lambda: self.jpeg_seq != last_seq or not self.running, timeout=timeout)
+            return self.jpeg_seq, self.jpeg
+
+    def _make_handler(self):
+        streamer = self
+
+        class PreviewHandler(BaseHTTPRequestHandler):
+            def _send_headers(self, content_type, length=None):
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Cache-Control", "no-cache, no-store")
+                self.send_header("Access-Control-Allow-Origin", "*")
+                if length is not None:
+                    self.send_header("Content-Length", str(length))
+                self.end_headers()
+
+            def do_GET(self):
+                path = self.path.split("?")[0]
+                try:
+                    if path == "/stream.mjpg":
+                        self._send_headers(f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+                        seq = 0
+                        while streamer.running:
+                            new_seq, jpeg = streamer._wait_for_jpeg(seq)
+                            if jpeg is None or new_seq == seq:
+                                continue
+                            seq = new_seq
+                            self.wfile.write(f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                                             f"Content-Length: {len(jpeg)}\r\n\r\n".encode())
+                            self.wfile.write(jpeg)
+                            self.wfile.write(b"\r\n")
+                    elif path == "/snapshot.jpg":
+                        _, jpeg = streamer._wait_for_jpeg(0, timeout=0)
+                        if jpeg is None:
+                            self.send_error(503, "No frame yet")
+                            return
+                        self._send_headers("image/jpeg", len(jpeg))
+                        self.wfile.write(jpeg)
+                    elif path == "/metrics.json":
+                        body = json.dumps(dict(streamer.metrics, stream_quality=streamer.quality,
+                                               stream_frames=streamer.encoded_frames)).encode()
+                        self._send_headers("application/json", len(body))
+                        self.wfile.write(body)
+                    else:
+                        self.send_error(404)
+                except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+                    pass  # Viewer went away
+
+            def log_message(self, format, *args):
+                pass  # Keep the console for gesture output
+
+        return PreviewHandler
+
+    def close(self):
+        """Stop the encoder and HTTP server."""
+        self.running = False
+        with self.frame_ready:
+            self.frame_ready.notify()
+        with self.jpeg_ready:
+            self.jpeg_ready.notify_all()
+        self.server.shutdown()
+        self.server.server_close()
+        self.encoder.join(timeout=1.0)
@@ -29,22 +29,28 @@ def initialize_webcam(width=1280, height=720, fps=30):
     
     return cap
 
-def read_frame(cap):
-    """Read and preprocess a frame from the webcam."""
-    ret, frame = cap.read()
-    if not ret:
-        print("Error: Failed to capture image.")
-        return None
-    
+def preprocess_frame(frame, mirror=True, enhance_contrast=True, out=None):
+    """Apply the webcam preprocessing steps to a frame, writing the result into out when given."""
     # Flip frame horizontally (mirror effect)
-    frame = cv2.flip(frame, 1)
+    if mirror:
+        frame = cv2.flip(frame, 1, dst=out)
     
     # Optional: Apply some preprocessing for better face detection
     # Enhance contrast slightly
-    frame = cv2.convertScaleAbs(frame, alpha=1.1, beta=10)
+    if enhance_contrast:
+        frame = cv2.convertScaleAbs(frame, dst=out, alpha=1.1, beta=10)
     
     return frame
 
+def read_frame(cap, out=None):
+    """Read and preprocess a frame from the webcam, into out (e.g. a preview ring slot) when given."""
+    ret, frame = cap.read()
+    if not ret:
+        print("Error: Failed to capture image.")
+        return None
+    
+    return preprocess_frame(frame, out=out)
+
 def release_webcam(cap):
     """Release the webcam resource."""
     if cap: